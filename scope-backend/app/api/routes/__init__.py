@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.routes import auth, complaints, users, chatbot, eda
+from app.api.routes import auth, complaints, users, chatbot, eda, ml, search
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
@@ -8,3 +8,5 @@ api_router.include_router(complaints.router, prefix="/complaints", tags=["compla
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(chatbot.router, prefix="/chatbot", tags=["chatbot"])
 api_router.include_router(eda.router, prefix="/eda", tags=["data-analysis"])
+api_router.include_router(ml.router, prefix="/ml", tags=["ml"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
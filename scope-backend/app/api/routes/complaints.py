@@ -11,20 +11,34 @@ from app.models.schemas.complaint import (
     ComplaintResponse,
     ComplaintUpdate,
     ComplaintPrediction,
+    ComplaintBatchClassify,
+    ComplaintBatchPrediction,
     PaginatedComplaintsResponse
 )
-from app.ml.model import get_model_predictor
+from app.ml.executor import InferenceOverloadedError, predict_async, predict_batch_async
+from app.core.config import settings
 
 router = APIRouter()
 
 
+def overloaded(e: InferenceOverloadedError) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"Classifier is busy ({e}). Try again shortly.",
+        headers={"Retry-After": "1"}
+    )
+
+
 @router.post("/", response_model=ComplaintResponse, status_code=status.HTTP_201_CREATED)
 async def create_complaint(
     complaint: ComplaintCreate,
     db: Session = Depends(get_db),
     current_user = Depends(get_current_user)
 ) -> Any:
-    return await ComplaintService.create_complaint(db=db, complaint=complaint)
+    try:
+        return await ComplaintService.create_complaint(db=db, complaint=complaint)
+    except InferenceOverloadedError as e:
+        raise overloaded(e)
 
 @router.get("/", response_model=PaginatedComplaintsResponse)
 async def read_complaints(
@@ -105,6 +119,25 @@ async def classify_complaint_text(
     complaint: ComplaintCreate,
     current_user = Depends(get_current_user)
 ) -> Any:
-    model_predictor = get_model_predictor()
-    prediction = model_predictor.predict(complaint.complaint_text)
+    try:
+        prediction = await predict_async(complaint.complaint_text)
+    except InferenceOverloadedError as e:
+        raise overloaded(e)
     return prediction
+
+
+@router.post("/classify/batch", response_model=ComplaintBatchPrediction)
+async def classify_complaint_texts(
+    batch: ComplaintBatchClassify,
+    current_user = Depends(get_current_staff_user)
+) -> Any:
+    if len(batch.texts) > settings.CLASSIFY_BATCH_MAX_TEXTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many texts in one request. Maximum is {settings.CLASSIFY_BATCH_MAX_TEXTS}."
+        )
+    try:
+        predictions = await predict_batch_async(batch.texts)
+    except InferenceOverloadedError as e:
+        raise overloaded(e)
+    return {"predictions": predictions}
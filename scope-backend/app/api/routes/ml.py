@@ -0,0 +1,105 @@
+from typing import Any, Dict
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import JSONResponse
+
+from app.api.dependencies.auth import get_current_admin_user
+from app.ml.model import get_inference_stats, get_model_readiness
+from app.ml.metrics import get_inference_metrics
+from app.ml.reload import ReloadInProgress, get_model_reloader
+from app.ml.shadow import get_shadow_evaluator
+from app.models.schemas.ml import ModelReloadRequest
+from app.services.classification_worker import get_classification_worker
+
+router = APIRouter()
+
+
+@router.get("/stats")
+async def get_model_stats(
+    current_user = Depends(get_current_admin_user)
+) -> Dict[str, Any]:
+    """
+    Get runtime statistics for the complaint classifier, such as batch sizes and queue waits.
+    """
+    stats = get_inference_stats()
+    worker = get_classification_worker()
+    stats["classification_worker"] = worker.stats() if worker is not None else None
+    return stats
+
+
+@router.get("/ready")
+async def get_model_ready() -> Any:
+    """
+    Readiness probe for load balancers. Returns 503 until the classifier is loaded and warm.
+    """
+    readiness = get_model_readiness()
+    if not readiness["ready"]:
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content=readiness)
+    return readiness
+
+
+@router.get("/metrics")
+async def get_model_metrics(
+    current_user = Depends(get_current_admin_user)
+) -> Dict[str, Any]:
+    """
+    Get per-stage inference timing histograms (tokenize, forward, postprocess, label decoding),
+    token counts and batch sizes for this worker.
+    """
+    return get_inference_metrics().snapshot()
+
+
+@router.delete("/metrics", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_model_metrics(
+    current_user = Depends(get_current_admin_user)
+) -> None:
+    get_inference_metrics().reset()
+
+
+@router.post("/reload", status_code=status.HTTP_202_ACCEPTED)
+async def reload_model(
+    request: ModelReloadRequest,
+    current_user = Depends(get_current_admin_user)
+) -> Dict[str, Any]:
+    """
+    Load a new checkpoint in the background, validate it on the holdout sample and swap it in
+    without dropping requests. Only the worker process that serves this request reloads.
+    """
+    try:
+        return get_model_reloader().start_reload(request.model_path, force=request.force)
+    except ReloadInProgress as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except (ValueError, FileNotFoundError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.get("/reload")
+async def get_reload_status(
+    current_user = Depends(get_current_admin_user)
+) -> Dict[str, Any]:
+    """
+    Get the state of the current reload and the outcome of recent ones.
+    """
+    return get_model_reloader().stats()
+
+
+@router.get("/shadow")
+async def get_shadow_stats(
+    current_user = Depends(get_current_admin_user)
+) -> Dict[str, Any]:
+    """
+    Compare the shadow model with the live one on sampled complaints: agreement, latency,
+    confidence distributions and the most common disagreements.
+    """
+    evaluator = get_shadow_evaluator()
+    if evaluator is None:
+        return {"enabled": False}
+    return {"enabled": True, **evaluator.stats()}
+
+
+@router.delete("/shadow", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_shadow_stats(
+    current_user = Depends(get_current_admin_user)
+) -> None:
+    evaluator = get_shadow_evaluator()
+    if evaluator is not None:
+        evaluator.reset()
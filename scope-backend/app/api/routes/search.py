@@ -0,0 +1,106 @@
+from typing import Any, Dict
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.api.dependencies.auth import get_current_admin_user, get_current_staff_user
+from app.chatbot import vector_index
+from app.chatbot.embeddings import get_embedding_cache_stats
+from app.models.schemas.search import ComplaintSearchFilters, ComplaintSearchHit, ComplaintSearchRequest, ComplaintSearchResponse
+
+router = APIRouter()
+
+
+def _search_complaints(request: ComplaintSearchRequest, hybrid: bool = False) -> ComplaintSearchResponse:
+    index = vector_index.get_complaint_index()
+    filters = ComplaintSearchFilters(**request.model_dump(include=set(ComplaintSearchFilters.model_fields)))
+    if hybrid:
+        results = index.hybrid_search_with_score(request.query, k=request.k, filters=filters)
+    else:
+        results = index.similarity_search_with_score(request.query, k=request.k, filters=filters)
+    return ComplaintSearchResponse(
+        query=request.query,
+        matching=index.count_matching(filters),
+        hits=[
+            ComplaintSearchHit(
+                id=doc.metadata["id"],
+                score=score,
+                complaint_text=doc.page_content,
+                category=doc.metadata["category"],
+                urgency=doc.metadata["urgency"],
+                status=doc.metadata["status"],
+                created_at=doc.metadata["created_at"],
+                vector_rank=doc.metadata.get("vector_rank"),
+                keyword_rank=doc.metadata.get("keyword_rank")
+            )
+            for doc, score in results
+        ]
+    )
+
+
+@router.post("/complaints", response_model=ComplaintSearchResponse)
+async def search_complaints(
+    request: ComplaintSearchRequest,
+    current_user = Depends(get_current_staff_user)
+) -> ComplaintSearchResponse:
+    """
+    Semantic search over complaints, optionally restricted by category, urgency, status and
+    creation date. Filters are applied inside the vector search, so up to k hits come back
+    however few complaints match.
+    """
+    try:
+        return await run_in_threadpool(_search_complaints, request)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search complaints: {str(e)}"
+        )
+
+
+@router.post("/hybrid", response_model=ComplaintSearchResponse)
+async def hybrid_search_complaints(
+    request: ComplaintSearchRequest,
+    current_user = Depends(get_current_staff_user)
+) -> ComplaintSearchResponse:
+    """
+    Hybrid complaint search: vector and BM25 keyword results fused by reciprocal rank fusion,
+    so both paraphrases and exact identifiers such as course codes and room numbers are found.
+    Takes the same filters as /complaints; scores are fused RRF scores.
+    """
+    try:
+        return await run_in_threadpool(_search_complaints, request, True)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to search complaints: {str(e)}"
+        )
+
+
+@router.get("/index")
+async def get_index_stats(
+    current_user = Depends(get_current_admin_user)
+) -> Dict[str, Any]:
+    """
+    Get the size and sync state of the complaint vector index in this worker, without loading it.
+    """
+    index = vector_index.complaint_index
+    if index is None:
+        return {"loaded": False, "embedding_cache": get_embedding_cache_stats()}
+    return {"loaded": True, **index.stats(), "embedding_cache": get_embedding_cache_stats()}
+
+
+@router.post("/index/rebuild")
+async def rebuild_index(
+    current_user = Depends(get_current_admin_user)
+) -> Dict[str, Any]:
+    """
+    Re-embed every complaint into a fresh vector index. Searches keep using the current index
+    until the new one is ready. Incremental updates make this unnecessary in normal operation.
+    """
+    try:
+        index = await run_in_threadpool(vector_index.get_complaint_index)
+        return await run_in_threadpool(index.rebuild)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to rebuild the vector index: {str(e)}"
+        )
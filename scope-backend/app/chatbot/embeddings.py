@@ -11,25 +11,250 @@ from langchain.tools import BaseTool
 from langchain.agents import create_openai_tools_agent, AgentExecutor
 from langchain_core.messages import HumanMessage, AIMessage
 from typing import List, Dict, Any, Optional, Type
+from sqlalchemy.exc import IntegrityError
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import numpy as np
 import pandas as pd
 import os
+import threading
 
 from app.core.config import settings
 from app.models.domain.complaint import Complaint
+from app.models.domain.embedding import TextEmbedding
+from app.ml.vectors import vector_from_bytes, vector_to_bytes
 from app.db.database import SessionLocal
+from app.chatbot.vector_index import ComplaintVectorIndex, get_complaint_index
 
 
-class ComplaintEmbedding:
-    def __init__(self):
+GOOGLE_EMBEDDING_MODEL = "models/embedding-001"
+
+
+class LocalSentenceEmbeddings(Embeddings):
+    """sentence-transformers encoder run on local CPU, no API key or network needed.
+    
+    Texts are encoded in batches of batch_size spread over at most max_workers threads. Each
+    thread keeps its own copy of the model, since a fast tokenizer can't be shared across
+    threads; torch releases the GIL, so batches run in parallel. Every encode, queries
+    included, runs on the pool, so there are never more than max_workers copies.
+    """
+    
+    def __init__(self, model_name: str, batch_size: int = 64, max_workers: int = 2, device: str = "cpu"):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.device = device
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="embedding")
+        # Load one copy up front so a bad model name fails here rather than mid-build
+        self._executor.submit(self._model).result()
+    
+    def _model(self):
+        model = getattr(self._local, "model", None)
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+            
+            model = SentenceTransformer(self.model_name, device=self.device)
+            self._local.model = model
+        return model
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return self._model().encode(
+            texts,
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+    
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts as a float32 matrix, one batch per task on the worker pool"""
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        if len(texts) <= self.batch_size:
+            return self._executor.submit(self._encode, texts).result()
+        batches = [texts[start:start + self.batch_size] for start in range(0, len(texts), self.batch_size)]
+        return np.vstack(list(self._executor.map(self._encode, batches)))
+    
+    @property
+    def dimension(self) -> int:
+        return self._executor.submit(lambda: self._model().get_sentence_embedding_dimension()).result()
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.encode(texts).tolist()
+    
+    def embed_query(self, text: str) -> List[float]:
+        return self._executor.submit(self._encode, [text]).result()[0].tolist()
+
+
+class CachedEmbeddings(Embeddings):
+    """Look document vectors up in the text_embeddings table and embed only the misses.
+    
+    Rows are keyed by the sha256 of the text and the model name, so an unchanged text is
+    embedded once per model across restarts and workers. Vectors are stored as float16.
+    Queries go straight to the model, since they rarely repeat.
+    """
+    
+    LOOKUP_CHUNK_SIZE = 500
+    
+    def __init__(self, embeddings: Embeddings, model_name: str, batch_size: int = 512):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.hits = 0
+        self.misses = 0
+    
+    def _lookup(self, db, hashes: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        for start in range(0, len(hashes), self.LOOKUP_CHUNK_SIZE):
+            rows = db.query(TextEmbedding.text_hash, TextEmbedding.vector).filter(
+                TextEmbedding.model_name == self.model_name,
+                TextEmbedding.text_hash.in_(hashes[start:start + self.LOOKUP_CHUNK_SIZE])
+            ).all()
+            found.update((row.text_hash, vector_from_bytes(row.vector)) for row in rows)
+        return found
+    
+    def _store(self, db, vectors: Dict[str, np.ndarray]):
+        db.add_all([
+            TextEmbedding(text_hash=h, model_name=self.model_name, vector=vector_to_bytes(v))
+            for h, v in vectors.items()
+        ])
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another worker stored some of these first; keep the rows that are still missing
+            db.rollback()
+            existing = set(self._lookup(db, list(vectors)))
+            db.add_all([
+                TextEmbedding(text_hash=h, model_name=self.model_name, vector=vector_to_bytes(v))
+                for h, v in vectors.items() if h not in existing
+            ])
+            db.commit()
+    
+    def _embed_misses(self, texts: List[str]) -> np.ndarray:
+        encode = getattr(self.embeddings, "encode", None)
+        vectors = encode(texts) if encode is not None else self.embeddings.embed_documents(texts)
+        return np.asarray(vectors, dtype=np.float32)
+    
+    def encode(self, texts: List[str]) -> np.ndarray:
+        hashes = [text_sha256(text) for text in texts]
+        db = SessionLocal()
+        try:
+            vectors = self._lookup(db, list(dict.fromkeys(hashes)))
+            hits = sum(1 for h in hashes if h in vectors)
+            self.hits += hits
+            self.misses += len(texts) - hits
+            
+            # Each distinct missing text is embedded once, in batches
+            missing = {h: text for h, text in zip(hashes, texts) if h not in vectors}
+            pending = list(missing.items())
+            for start in range(0, len(pending), self.batch_size):
+                batch = pending[start:start + self.batch_size]
+                embedded = self._embed_misses([text for _, text in batch])
+                new = {h: vector for (h, _), vector in zip(batch, embedded)}
+                self._store(db, new)
+                # Round through float16 so fresh and cached vectors are identical
+                vectors.update((h, vector_from_bytes(vector_to_bytes(v))) for h, v in new.items())
+        finally:
+            db.close()
+        
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack([vectors[h] for h in hashes])
+    
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.encode(texts).tolist()
+    
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
+    
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "model_name": self.model_name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+def text_sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def get_embedding_model_name() -> str:
+    """Name recorded with every stored vector, so vectors from different models never mix"""
+    if settings.EMBEDDING_BACKEND == "local":
+        return get_local_embedding_model_name()
+    return GOOGLE_EMBEDDING_MODEL
+
+
+def get_local_embedding_model_name() -> str:
+    return f"local/{settings.LOCAL_EMBEDDING_MODEL}"
+
+
+# Singleton instances
+_embeddings: Optional[Embeddings] = None
+_local_embeddings: Optional[LocalSentenceEmbeddings] = None
+_cached_embeddings: Dict[str, CachedEmbeddings] = {}
+_embeddings_lock = threading.Lock()
+
+
+def with_embedding_cache(embeddings: Embeddings, model_name: str) -> Embeddings:
+    """Put the text_embeddings table in front of a model, once per model name"""
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return embeddings
+    cached = _cached_embeddings.get(model_name)
+    if cached is None:
+        cached = _cached_embeddings.setdefault(
+            model_name,
+            CachedEmbeddings(embeddings, model_name, batch_size=settings.VECTOR_INDEX_EMBED_BATCH_SIZE)
+        )
+    return cached
+
+
+def get_embedding_cache_stats() -> List[Dict[str, Any]]:
+    return [cached.stats() for cached in _cached_embeddings.values()]
+
+
+def get_local_embeddings() -> LocalSentenceEmbeddings:
+    """The local sentence encoder, loaded once per process"""
+    global _local_embeddings
+    if _local_embeddings is None:
+        with _embeddings_lock:
+            if _local_embeddings is None:
+                _local_embeddings = LocalSentenceEmbeddings(
+                    settings.LOCAL_EMBEDDING_MODEL,
+                    batch_size=settings.EMBEDDING_BATCH_SIZE,
+                    max_workers=settings.EMBEDDING_WORKERS,
+                    device=settings.EMBEDDING_DEVICE
+                )
+    return _local_embeddings
+
+
+def get_embeddings() -> Embeddings:
+    """The embedding backend selected by EMBEDDING_BACKEND, either google or local, behind the embedding cache"""
+    global _embeddings
+    if settings.EMBEDDING_BACKEND == "local":
+        return with_embedding_cache(get_local_embeddings(), get_embedding_model_name())
+    if settings.EMBEDDING_BACKEND != "google":
+        raise ValueError(f"Unknown embedding backend '{settings.EMBEDDING_BACKEND}'")
+    
+    if _embeddings is None:
         from langchain_google_genai import GoogleGenerativeAIEmbeddings
         
         if not settings.GOOGLE_API_KEY:
-            raise ValueError("Google API key not set. Please set the GOOGLE_API_KEY environment variable.")
+            raise ValueError("Google API key not set. Please set the GOOGLE_API_KEY environment variable, or use EMBEDDING_BACKEND=local.")
         
-        self.embeddings = GoogleGenerativeAIEmbeddings(
-            model="models/embedding-001",
+        _embeddings = GoogleGenerativeAIEmbeddings(
+            model=GOOGLE_EMBEDDING_MODEL,
             google_api_key=settings.GOOGLE_API_KEY
         )
+    return with_embedding_cache(_embeddings, get_embedding_model_name())
+
+
+class ComplaintEmbedding:
+    def __init__(self):
+        self.embeddings = get_embeddings()
         self.vector_store = None
     
     def load_complaints_from_db(self) -> List[Document]:
@@ -60,18 +285,17 @@ class ComplaintEmbedding:
         finally:
             db.close()
     
-    def create_vector_store(self) -> VectorStore:
-        documents = self.load_complaints_from_db()
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)
-        chunks = text_splitter.split_documents(documents)
-        self.vector_store = FAISS.from_documents(chunks, self.embeddings)
+    def create_vector_store(self) -> ComplaintVectorIndex:
+        """Re-embed every complaint into the shared persistent index"""
+        self.vector_store = get_complaint_index()
+        self.vector_store.rebuild()
         return self.vector_store
     
-    def get_vector_store(self) -> VectorStore:
+    def get_vector_store(self) -> ComplaintVectorIndex:
+        # The index is loaded once per process and kept current incrementally
         if self.vector_store is None:
-            return self.create_vector_store()
+            self.vector_store = get_complaint_index()
         return self.vector_store
     
-    def refresh_vector_store(self) -> VectorStore:
-        self.vector_store = None
+    def refresh_vector_store(self) -> ComplaintVectorIndex:
         return self.create_vector_store()
@@ -0,0 +1,157 @@
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Letter runs and digit runs, so "CS101", "CS-101" and "CS 101" all yield "cs" and "101"
+TOKEN_PATTERN = re.compile(r"[a-z]+|\d+")
+STOPWORDS = {
+    'the', 'and', 'to', 'of', 'is', 'in', 'it', 'that', 'was', 'for', 'on', 'are', 'with', 'as',
+    'at', 'be', 'this', 'have', 'from', 'or', 'an', 'by', 'but', 'not', 'what', 'all', 'were',
+    'we', 'when', 'your', 'can', 'there', 'been', 'has', 'if', 'my', 'me', 'so', 'do', 'a', 'i',
+    'am', 'im', 'its', 'just', 'any', 'about', 'would', 'could', 'very', 'our', 'you', 'they',
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word and number tokens without stopwords.
+
+    A letter run directly followed by a number is also emitted joined ("CHEM 102" gives
+    "chem", "102" and "chem102"), so course codes and room numbers match as one term
+    however they were typed.
+    """
+    runs = TOKEN_PATTERN.findall(text.lower())
+    tokens = [run for run in runs if run not in STOPWORDS]
+    for first, second in zip(runs, runs[1:]):
+        if first.isalpha() and second.isdigit():
+            tokens.append(first + second)
+    return tokens
+
+
+class BM25Index:
+    """In-memory inverted index over complaint texts with Okapi BM25 scoring.
+
+    Documents are added, replaced and removed one at a time, updating only the postings of
+    their own terms, so the index follows the complaints table without ever being rebuilt.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        # term -> {doc id: term frequency}
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.doc_terms: Dict[int, Counter] = {}
+        self.doc_lengths: Dict[int, int] = {}
+        self.total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def add(self, doc_id: int, text: str):
+        terms = Counter(tokenize(text))
+        with self._lock:
+            if self.doc_terms.get(doc_id) == terms:
+                return
+            self.remove(doc_id)
+            for term, count in terms.items():
+                self.postings.setdefault(term, {})[doc_id] = count
+            self.doc_terms[doc_id] = terms
+            self.doc_lengths[doc_id] = sum(terms.values())
+            self.total_length += self.doc_lengths[doc_id]
+
+    def add_many(self, documents: Iterable[Tuple[int, str]]):
+        for doc_id, text in documents:
+            self.add(doc_id, text)
+
+    def remove(self, doc_id: int):
+        with self._lock:
+            terms = self.doc_terms.pop(doc_id, None)
+            if terms is None:
+                return
+            for term in terms:
+                postings = self.postings[term]
+                del postings[doc_id]
+                if not postings:
+                    del self.postings[term]
+            self.total_length -= self.doc_lengths.pop(doc_id)
+
+    def search(self, query: str, k: int = 5, allowed: Optional[Callable[[int], bool]] = None) -> List[Tuple[int, float]]:
+        """Ids and BM25 scores of the k best matching documents, only among allowed ids if given"""
+        terms = set(tokenize(query))
+        scores: Dict[int, float] = {}
+        with self._lock:
+            count = len(self.doc_lengths)
+            if not count:
+                return []
+            average_length = self.total_length / count
+            for term in terms:
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    if allowed is not None and not allowed(doc_id):
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def stats(self):
+        with self._lock:
+            return {"documents": len(self.doc_lengths), "terms": len(self.postings)}
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Postings as flat arrays for np.savez: each term's doc ids and frequencies sit at
+        offsets[i]:offsets[i + 1], and the terms themselves are newline-joined bytes"""
+        with self._lock:
+            terms = sorted(self.postings)
+            offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+            offsets[1:] = np.cumsum([len(self.postings[term]) for term in terms])
+            docs = np.empty(offsets[-1], dtype=np.int64)
+            frequencies = np.empty(offsets[-1], dtype=np.int32)
+            for term, start, end in zip(terms, offsets[:-1], offsets[1:]):
+                postings = self.postings[term]
+                docs[start:end] = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+                frequencies[start:end] = np.fromiter(postings.values(), dtype=np.int32, count=len(postings))
+            return {
+                "terms": np.frombuffer("\n".join(terms).encode(), dtype=np.uint8),
+                "offsets": offsets,
+                "docs": docs,
+                "frequencies": frequencies,
+                # Kept separately so documents without a single term still count towards idf
+                "doc_ids": np.fromiter(self.doc_lengths.keys(), dtype=np.int64, count=len(self.doc_lengths)),
+                "doc_lengths": np.fromiter(self.doc_lengths.values(), dtype=np.int64, count=len(self.doc_lengths)),
+            }
+
+    @classmethod
+    def from_arrays(cls, arrays, k1: float = 1.2, b: float = 0.75) -> "BM25Index":
+        """Rebuild an index from to_arrays output without re-tokenizing any text"""
+        index = cls(k1, b)
+        raw = bytes(arrays["terms"]).decode()
+        terms = raw.split("\n") if raw else []
+        offsets = arrays["offsets"].tolist()
+        docs = arrays["docs"].tolist()
+        frequencies = arrays["frequencies"].tolist()
+        index.doc_lengths = dict(zip(arrays["doc_ids"].tolist(), arrays["doc_lengths"].tolist()))
+        index.doc_terms = {doc_id: Counter() for doc_id in index.doc_lengths}
+        for term, start, end in zip(terms, offsets, offsets[1:]):
+            postings = dict(zip(docs[start:end], frequencies[start:end]))
+            index.postings[term] = postings
+            for doc_id, frequency in postings.items():
+                index.doc_terms[doc_id][term] = frequency
+        index.total_length = sum(index.doc_lengths.values())
+        return index
+
+
+def reciprocal_rank_fusion(rankings: List[List[int]], k: int, rrf_k: int = 60) -> List[Tuple[int, float]]:
+    """Fuse ranked id lists by summing 1 / (rrf_k + rank); only ranks matter, not the retrievers' score scales"""
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (rrf_k + rank)
+    return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
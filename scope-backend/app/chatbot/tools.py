@@ -19,6 +19,10 @@ from app.ml.model import get_model_predictor
 
 class SearchComplaintInput(BaseModel):
     query: str = Field(..., description="The search query to find complaints")
+    category: Optional[str] = Field(default=None, description="Only search this category (Academic, Facilities, Housing, IT Support, Financial Aid, Campus Life, Dining Services, Other)")
+    urgency: Optional[str] = Field(default=None, description="Only search this urgency (Low, Medium, High, Critical)")
+    status: Optional[str] = Field(default=None, description="Only search this status (Pending, In Progress, Resolved, Closed)")
+    days: Optional[int] = Field(default=None, description="Only search complaints created in the last N days")
 
 
 class GetComplaintInput(BaseModel):
@@ -68,22 +72,56 @@ class BatchUpdateStatusInput(BaseModel):
 
 class SearchComplaintTool(BaseTool):
     name: str = "search_complaints" 
-    description: str = "Search for complaints using keywords or phrases"
+    description: str = "Search for complaints using keywords or phrases, optionally only within a category, urgency, status or the last N days"
     args_schema: Type[SearchComplaintInput] = SearchComplaintInput # type: ignore
     
-    def _run(self, query: str) -> str:
-        from app.chatbot.embeddings import ComplaintEmbedding
+    def _run(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        urgency: Optional[str] = None,
+        status: Optional[str] = None,
+        days: Optional[int] = None
+    ) -> str:
+        from app.chatbot.vector_index import get_complaint_index
+        from app.core.config import settings
+        from app.models.schemas.search import ComplaintSearchFilters
         
         try:
-            embedding_manager = ComplaintEmbedding()
-            vector_store = embedding_manager.get_vector_store()
-            results = vector_store.similarity_search(query, k=5)
-            
+            # Match the labels the agent passes case-insensitively
+            category_value = next((c for c in Category if category and c.value.lower() == category.strip().lower()), None)
+            urgency_value = next((u for u in Urgency if urgency and u.value.lower() == urgency.strip().lower()), None)
+            if category and category_value is None:
+                return f"❌ Unknown category '{category}'. Use one of: {', '.join(c.value for c in Category)}"
+            if urgency and urgency_value is None:
+                return f"❌ Unknown urgency '{urgency}'. Use one of: {', '.join(u.value for u in Urgency)}"
+            filters = ComplaintSearchFilters(
+                category=category_value,
+                urgency=urgency_value,
+                status=status,
+                created_from=datetime.utcnow() - timedelta(days=days) if days else None
+            )
+            
+            # One index per process, kept current incrementally instead of re-embedded per query;
+            # filters restrict the search itself, so a narrow filter still returns 5 hits when it can.
+            # Hybrid search also matches exact course codes and room numbers the embeddings miss
+            index = get_complaint_index()
+            if settings.CHATBOT_SEARCH_MODE == "hybrid":
+                results = [doc for doc, _ in index.hybrid_search_with_score(query, k=5, filters=filters)]
+            else:
+                results = index.similarity_search(query, k=5, filters=filters)
+            
+            applied = ", ".join(
+                f"{name}: {value}" for name, value in
+                (("category", category_value and category_value.value), ("urgency", urgency_value and urgency_value.value),
+                 ("status", status), ("last days", days))
+                if value
+            )
             if not results:
-                return "No complaints found matching your query."
+                return f"No complaints found matching your query{f' ({applied})' if applied else ''}."
             
             # Create a formatted markdown table for better UI display
-            output = f"### 🔍 Search Results for: '{query}'\n\n"
+            output = f"### 🔍 Search Results for: '{query}'{f' ({applied})' if applied else ''}\n\n"
             output += "| ID | Preview | Category | Urgency | Status |\n"
             output += "|---|---------|----------|---------|--------|\n"
             
@@ -110,8 +148,15 @@ class SearchComplaintTool(BaseTool):
         except Exception as e:
             return f"Error searching complaints: {str(e)}"
     
-    async def _arun(self, query: str) -> str:
-        return self._run(query)
+    async def _arun(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        urgency: Optional[str] = None,
+        status: Optional[str] = None,
+        days: Optional[int] = None
+    ) -> str:
+        return self._run(query, category, urgency, status, days)
 
 
 class GetComplaintTool(BaseTool):
@@ -0,0 +1,795 @@
+import fcntl
+import hashlib
+import json
+import math
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import faiss
+import numpy as np
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from sqlalchemy import func
+
+from app.chatbot.keyword_index import BM25Index, reciprocal_rank_fusion
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.models.domain.complaint import Complaint
+from app.models.schemas.search import ComplaintSearchFilters
+
+
+def text_hash(text: str) -> int:
+    """64-bit content hash of a complaint text, stored per id to skip unchanged texts"""
+    return int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little", signed=True)
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Unit-length rows, so inner product search ranks by cosine similarity"""
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+INDEX_TYPES = ("flat", "ivf", "hnsw")
+FILTER_ATTRIBUTES = ("category", "urgency", "status")
+
+
+def ivf_nlist(corpus_size: int, training_size: int) -> int:
+    """IVF list count: VECTOR_INDEX_IVF_NLIST, or about 4 * sqrt(n), with at least 39 training points per list"""
+    nlist = settings.VECTOR_INDEX_IVF_NLIST or int(4 * math.sqrt(max(corpus_size, 1)))
+    return max(1, min(nlist, training_size // 39))
+
+
+def create_faiss_index(
+    index_type: str,
+    dimension: int,
+    training_vectors: Optional[np.ndarray] = None,
+    corpus_size: Optional[int] = None,
+    nlist: Optional[int] = None,
+    m: Optional[int] = None,
+    ef_construction: Optional[int] = None
+):
+    """Empty inner product index of the given type; IVF trains its coarse centroids on training_vectors.
+
+    flat is exact and scans every vector. ivf only scans the nprobe lists nearest to the query.
+    hnsw walks a proximity graph, uses the most memory and cannot remove vectors, so
+    ComplaintVectorIndex tombstones replaced ones instead.
+    """
+    if index_type == "flat":
+        return faiss.IndexIDMap2(faiss.IndexFlatIP(dimension))
+    if index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dimension, m or settings.VECTOR_INDEX_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = ef_construction or settings.VECTOR_INDEX_HNSW_EF_CONSTRUCTION
+        return index
+    if index_type == "ivf":
+        if training_vectors is None or len(training_vectors) == 0:
+            raise ValueError("An IVF index needs training vectors")
+        nlist = nlist or ivf_nlist(corpus_size or len(training_vectors), len(training_vectors))
+        index = faiss.index_factory(dimension, f"IVF{nlist},Flat", faiss.METRIC_INNER_PRODUCT)
+        index.train(np.ascontiguousarray(training_vectors, dtype=np.float32))
+        return index
+    raise ValueError(f"Unknown vector index type {index_type!r}, expected one of {', '.join(INDEX_TYPES)}")
+
+
+def search_parameters(index_type: str, selector=None, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+    """Per-query search knobs, so nprobe and efSearch can be tuned without rebuilding the index"""
+    params = {"sel": selector} if selector is not None else {}
+    if index_type == "ivf":
+        return faiss.SearchParametersIVF(nprobe=nprobe or settings.VECTOR_INDEX_IVF_NPROBE, **params)
+    if index_type == "hnsw":
+        return faiss.SearchParametersHNSW(efSearch=ef_search or settings.VECTOR_INDEX_HNSW_EF_SEARCH, **params)
+    return faiss.SearchParameters(**params) if params else None
+
+
+def _timestamp(value: datetime) -> float:
+    # created_at is stored as naive UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _attribute_value(value) -> Optional[str]:
+    if value is None:
+        return None
+    return str(getattr(value, "value", value)).strip().lower()
+
+
+class LabelAttributes:
+    """Filterable attributes of every index label, in flat arrays indexed by label.
+
+    Category, urgency and status are stored as small integer codes and creation time as a
+    timestamp, so a filter becomes a few vectorized comparisons that produce a bitmap of the
+    matching labels, whatever the size of the index.
+    """
+
+    def __init__(self):
+        self.vocab: Dict[str, Dict[str, int]] = {attribute: {} for attribute in FILTER_ATTRIBUTES}
+        self.codes = {attribute: np.zeros(0, dtype=np.int16) for attribute in FILTER_ATTRIBUTES}
+        self.created = np.zeros(0, dtype=np.float64)
+        self.live = np.zeros(0, dtype=bool)
+
+    def _grow(self, size: int):
+        if size <= len(self.live):
+            return
+        capacity = max(size, 2 * len(self.live), 1024)
+        for attribute, codes in self.codes.items():
+            self.codes[attribute] = np.concatenate([codes, np.zeros(capacity - len(codes), dtype=np.int16)])
+        self.created = np.concatenate([self.created, np.zeros(capacity - len(self.created))])
+        self.live = np.concatenate([self.live, np.zeros(capacity - len(self.live), dtype=bool)])
+
+    def _code(self, attribute: str, value) -> int:
+        value = _attribute_value(value)
+        if value is None:
+            return 0
+        vocab = self.vocab[attribute]
+        if value not in vocab:
+            vocab[value] = len(vocab) + 1
+        return vocab[value]
+
+    def set(self, label: int, category, urgency, status, created_at: Optional[datetime]):
+        self._grow(label + 1)
+        for attribute, value in zip(FILTER_ATTRIBUTES, (category, urgency, status)):
+            self.codes[attribute][label] = self._code(attribute, value)
+        self.created[label] = _timestamp(created_at) if created_at is not None else np.nan
+        self.live[label] = True
+
+    def clear(self, label: int):
+        if label < len(self.live):
+            self.live[label] = False
+
+    def take(self, labels: np.ndarray) -> "LabelAttributes":
+        """Attributes re-indexed so that old label labels[i] becomes label i"""
+        if len(labels):
+            self._grow(int(labels.max()) + 1)
+        taken = LabelAttributes()
+        taken.vocab = self.vocab
+        taken.codes = {attribute: codes[labels] for attribute, codes in self.codes.items()}
+        taken.created = self.created[labels]
+        taken.live = self.live[labels]
+        return taken
+
+    def mask(self, filters: ComplaintSearchFilters) -> np.ndarray:
+        """Boolean mask over labels of the live entries that pass every filter"""
+        mask = self.live.copy()
+        for attribute in FILTER_ATTRIBUTES:
+            value = _attribute_value(getattr(filters, attribute))
+            if value is None:
+                continue
+            code = self.vocab[attribute].get(value)
+            if code is None:
+                return np.zeros_like(mask)
+            mask &= self.codes[attribute] == code
+        # NaN creation times fail both comparisons, so undated rows drop out of date filters
+        if filters.created_from is not None:
+            mask &= self.created >= _timestamp(filters.created_from)
+        if filters.created_to is not None:
+            mask &= self.created <= _timestamp(filters.created_to)
+        return mask
+
+
+def has_filters(filters: Optional[ComplaintSearchFilters]) -> bool:
+    return filters is not None and any(getattr(filters, name) is not None for name in ComplaintSearchFilters.model_fields)
+
+
+def complaint_document(complaint: Complaint, score: Optional[float] = None) -> Document:
+    metadata = {
+        "id": complaint.id,
+        "category": complaint.category.value if complaint.category is not None else None,
+        "urgency": complaint.urgency.value if complaint.urgency is not None else None,
+        "status": complaint.status,
+        "created_at": str(complaint.created_at),
+    }
+    if complaint.response is not None:
+        metadata["response"] = complaint.response
+    if score is not None:
+        metadata["score"] = score
+    return Document(page_content=str(complaint.complaint_text), metadata=metadata)
+
+
+class ComplaintVectorIndex:
+    """FAISS index of complaint vectors keyed by complaint id, persisted under VECTOR_INDEX_DIR.
+
+    Each process loads the index once and keeps it current by re-embedding only complaints
+    whose text changed since the last sync (found through updated_at) and dropping deleted
+    ids. Rebuilding from scratch only happens when asked for, or when the embedding model
+    differs from the one the saved index was built with, or the index type changed.
+    """
+
+    def __init__(self, embeddings: Embeddings, model_name: str, index_dir: str, index_type: str = "flat"):
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unknown vector index type {index_type!r}, expected one of {', '.join(INDEX_TYPES)}")
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.index_dir = Path(index_dir)
+        self.index_type = index_type
+        self.index = None
+        self.dimension = None
+        self.trained_on = 0
+        # Content hash per indexed complaint id
+        self.hashes: Dict[int, int] = {}
+        self.watermark: Optional[datetime] = None
+
+        # HNSW labels are graph rows: the complaint id of every row, the live row of every id,
+        # and rows whose complaint was edited or deleted, skipped at search time until compaction
+        self.rows: List[int] = []
+        self.row_of: Dict[int, int] = {}
+        self.tombstones: Set[int] = set()
+        self._tombstone_selector = None
+        # Category, urgency, status and creation time per label, for filtered search
+        self.attributes = LabelAttributes()
+        # BM25 over the same complaints, for hybrid search; its postings are saved with the vectors
+        self.keywords = BM25Index()
+
+        self._lock = threading.RLock()
+        # Only one sync embeds at a time; searches don't wait for a running sync
+        self._sync_lock = threading.Lock()
+        self._changed: Set[int] = set()
+        self._deleted: Set[int] = set()
+        self._last_sync = 0.0
+        self._last_save = 0.0
+        self._dirty = False
+        self._compacting = False
+        self.embedded = 0
+
+    @property
+    def _current_path(self) -> Path:
+        return self.index_dir / "CURRENT"
+
+    def _saved_dir(self) -> Path:
+        """Directory of the last published save; indexes saved before versioning sit in index_dir itself"""
+        try:
+            return self.index_dir / self._current_path.read_text().strip()
+        except FileNotFoundError:
+            return self.index_dir
+
+    @staticmethod
+    def _files(directory: Path) -> Dict[str, Path]:
+        return {
+            "index": directory / "complaints.faiss",
+            "meta": directory / "complaints.json",
+            "hashes": directory / "complaints-hashes.npz",
+            "keywords": directory / "complaints-keywords.npz",
+        }
+
+    def load(self) -> bool:
+        """Load the saved index if it was built with the current embedding model"""
+        try:
+            return self._load_from(self._saved_dir())
+        except FileNotFoundError:
+            # Another worker published a newer save and pruned the one being read; read that instead
+            return self._load_from(self._saved_dir())
+
+    def _load_from(self, directory: Path) -> bool:
+        files = self._files(directory)
+        if not (files["index"].exists() and files["meta"].exists() and files["hashes"].exists()):
+            return False
+        with open(files["meta"]) as f:
+            meta = json.load(f)
+        if meta.get("model_name") != self.model_name:
+            print(f"Vector index was built with {meta.get('model_name')}, not {self.model_name}; rebuilding")
+            return False
+        if meta.get("index_type", "flat") != self.index_type:
+            print(f"Vector index is a {meta.get('index_type', 'flat')} index, not {self.index_type}; rebuilding")
+            return False
+
+        with self._lock:
+            self.index = faiss.read_index(str(files["index"]))
+            self.dimension = meta["dimension"]
+            self.watermark = datetime.fromisoformat(meta["watermark"]) if meta.get("watermark") else None
+            self.trained_on = meta.get("trained_on", 0)
+            stored = np.load(files["hashes"])
+            self.hashes = dict(zip(stored["ids"].tolist(), stored["hashes"].tolist()))
+            if self.index_type == "hnsw":
+                # A complaint's last row is its live one; any earlier row is a tombstone
+                self.rows = stored["rows"].tolist()
+                self.row_of = {i: row for row, i in enumerate(self.rows) if i in self.hashes}
+                self.tombstones = {row for row, i in enumerate(self.rows) if self.row_of.get(i) != row}
+                self._tombstone_selector = None
+            self._last_save = time.monotonic()
+        # Indexes saved before the postings were persisted build them once from the table
+        keywords_saved = files["keywords"].exists()
+        if keywords_saved:
+            self.keywords = BM25Index.from_arrays(np.load(files["keywords"]))
+        # Attributes change without the text changing, so they are read fresh rather than saved
+        self._load_table_state(with_texts=not keywords_saved)
+        return True
+
+    def _label(self, complaint_id: int) -> Optional[int]:
+        if self.index_type == "hnsw":
+            return self.row_of.get(complaint_id)
+        return complaint_id if complaint_id in self.hashes else None
+
+    def _set_attributes(self, rows):
+        with self._lock:
+            for row in rows:
+                label = self._label(row.id)
+                if label is not None:
+                    self.attributes.set(label, row.category, row.urgency, row.status, row.created_at)
+
+    def _load_table_state(self, with_texts: bool = False):
+        columns = [Complaint.id, Complaint.category, Complaint.urgency, Complaint.status, Complaint.created_at]
+        if with_texts:
+            columns.append(Complaint.complaint_text)
+        db = SessionLocal()
+        try:
+            rows = db.query(*columns).all()
+        finally:
+            db.close()
+        self._set_attributes(rows)
+        if with_texts:
+            self.keywords.add_many((row.id, str(row.complaint_text)) for row in rows if row.id in self.hashes)
+
+    def save(self):
+        """Write the index as a new version directory and publish it by swapping CURRENT.
+
+        Readers in other workers see either the previous set of files or this one, never a mix.
+        Workers sharing index_dir take turns through a file lock, so they never prune a
+        directory another one is still writing.
+        """
+        with self._lock:
+            if self.index is None:
+                return
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.index_dir / ".save.lock", "w") as lock:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+                self._save_version()
+
+    def _save_version(self):
+        directory = Path(tempfile.mkdtemp(prefix="complaints-", dir=self.index_dir))
+        files = self._files(directory)
+        ids = np.fromiter(self.hashes.keys(), dtype=np.int64, count=len(self.hashes))
+        hashes = np.fromiter(self.hashes.values(), dtype=np.int64, count=len(self.hashes))
+
+        faiss.write_index(self.index, str(files["index"]))
+        with open(files["hashes"], "wb") as f:
+            np.savez(f, ids=ids, hashes=hashes, rows=np.array(self.rows, dtype=np.int64))
+        with open(files["keywords"], "wb") as f:
+            np.savez(f, **self.keywords.to_arrays())
+        with open(files["meta"], "w") as f:
+            json.dump({
+                "model_name": self.model_name,
+                "index_type": self.index_type,
+                "dimension": self.dimension,
+                "trained_on": self.trained_on,
+                "watermark": self.watermark.isoformat() if self.watermark else None,
+                "count": len(self.hashes),
+            }, f)
+
+        # Publishing is a single rename of the pointer file
+        previous = self._saved_dir()
+        fd, pointer = tempfile.mkstemp(prefix=".CURRENT-", dir=self.index_dir)
+        with os.fdopen(fd, "w") as f:
+            f.write(directory.name)
+        os.replace(pointer, self._current_path)
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+        # Keep the version just replaced for workers still loading it; drop anything older,
+        # including directories left by interrupted saves and the pre-versioning flat files
+        for entry in self.index_dir.iterdir():
+            if entry.is_dir() and entry.name.startswith("complaints-") and entry not in (directory, previous):
+                shutil.rmtree(entry, ignore_errors=True)
+        if previous != self.index_dir:
+            for path in self._files(self.index_dir).values():
+                path.unlink(missing_ok=True)
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        # The local encoder hands back a matrix directly, skipping the list round trip
+        encode = getattr(self.embeddings, "encode", None)
+        vectors = encode(texts) if encode is not None else self.embeddings.embed_documents(texts)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.embedded += len(texts)
+        return normalize_rows(vectors)
+
+    def _create_index(self, training_vectors: np.ndarray, corpus_size: int):
+        self.dimension = training_vectors.shape[1]
+        self.index = create_faiss_index(self.index_type, self.dimension, training_vectors, corpus_size)
+        self.trained_on = len(training_vectors) if self.index_type == "ivf" else 0
+
+    def _train(self):
+        """Train IVF centroids on a random sample of complaints before anything is added"""
+        db = SessionLocal()
+        try:
+            count = db.query(func.count(Complaint.id)).scalar()
+            rows = (
+                db.query(Complaint.complaint_text)
+                .order_by(func.random())
+                .limit(settings.VECTOR_INDEX_TRAIN_SAMPLE)
+                .all()
+            )
+        finally:
+            db.close()
+        if not rows:
+            return
+        # With the embedding cache on, these vectors are reused when the sample is indexed
+        started = time.perf_counter()
+        vectors = self._embed([str(row.complaint_text) for row in rows])
+        with self._lock:
+            self._create_index(vectors, count)
+        print(f"Trained {self.index.nlist} IVF lists on {len(rows)} of {count} complaints in {time.perf_counter() - started:.1f}s")
+
+    def _add(self, ids: List[int], vectors: np.ndarray):
+        if self.index_type == "hnsw":
+            start = self.index.ntotal
+            self.index.add(vectors)
+            for offset, i in enumerate(ids):
+                self.row_of[i] = start + offset
+            self.rows.extend(ids)
+        else:
+            self.index.add_with_ids(vectors, np.array(ids, dtype=np.int64))
+
+    def _drop(self, ids: List[int]):
+        if self.index_type == "hnsw":
+            for i in ids:
+                row = self.row_of.pop(i, None)
+                if row is not None:
+                    self.tombstones.add(row)
+                    self.attributes.clear(row)
+            self._tombstone_selector = None
+        else:
+            self.index.remove_ids(np.array(ids, dtype=np.int64))
+            for i in ids:
+                self.attributes.clear(i)
+
+    def _compact_in_background(self):
+        """Compact on a thread of its own; searches keep using the current graph meanwhile"""
+        try:
+            # Like rebuild, hold off other syncs; their changes are applied once the new graph is in
+            with self._sync_lock:
+                self._compact()
+        except Exception as e:
+            print(f"Warning: Compacting the HNSW vector index failed: {e}")
+        finally:
+            self._compacting = False
+
+    def _compact(self):
+        """Rebuild the HNSW graph from its own stored vectors once too many rows are tombstoned.
+
+        Only syncs mutate the index and the caller holds _sync_lock, so the new graph is built
+        without blocking searches and swapped in at the end.
+        """
+        with self._lock:
+            live = sorted(self.row_of.items(), key=lambda item: item[1])
+            index = self.index
+        started = time.perf_counter()
+        live_rows = np.array([row for _, row in live], dtype=np.int64)
+        fresh = create_faiss_index("hnsw", self.dimension)
+        if live:
+            fresh.add(index.reconstruct_batch(live_rows))
+        with self._lock:
+            self.index = fresh
+            self.attributes = self.attributes.take(live_rows)
+            self.rows = [i for i, _ in live]
+            self.row_of = {i: row for row, i in enumerate(self.rows)}
+            self.tombstones = set()
+            self._tombstone_selector = None
+            self._dirty = True
+        print(f"Compacted the HNSW vector index to {len(live)} rows in {time.perf_counter() - started:.1f}s")
+
+    def _upsert(self, ids: List[int], texts: List[str]):
+        """Embed and (re)insert complaints whose text is new or changed"""
+        hashes = [text_hash(text) for text in texts]
+        pending = [(i, text, h) for i, text, h in zip(ids, texts, hashes) if self.hashes.get(i) != h]
+        if not pending:
+            return
+
+        batch_size = settings.VECTOR_INDEX_EMBED_BATCH_SIZE
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            vectors = self._embed([text for _, text, _ in batch])
+            with self._lock:
+                if self.index is None:
+                    # An IVF index only trains here when the table was empty at rebuild time
+                    self._create_index(vectors, len(pending))
+                # Edited complaints replace their old vector
+                replaced = [i for i, _, _ in batch if i in self.hashes]
+                if replaced:
+                    self._drop(replaced)
+                self._add([i for i, _, _ in batch], vectors)
+                for i, _, h in batch:
+                    self.hashes[i] = h
+                self._dirty = True
+
+    def _remove(self, ids: List[int]):
+        with self._lock:
+            ids = [i for i in ids if i in self.hashes]
+            if not ids or self.index is None:
+                return
+            self._drop(ids)
+            for i in ids:
+                del self.hashes[i]
+                self.keywords.remove(i)
+            self._dirty = True
+
+    def rebuild(self) -> Dict[str, Any]:
+        """Re-embed every complaint into a fresh index, then swap it in; searches keep using the old one meanwhile"""
+        started = time.perf_counter()
+        with self._sync_lock:
+            fresh = ComplaintVectorIndex(self.embeddings, self.model_name, str(self.index_dir), self.index_type)
+            fresh._last_save = time.monotonic()
+            if self.index_type == "ivf":
+                fresh._train()
+            fresh.sync(force=True)
+            with self._lock:
+                self.index = fresh.index
+                self.dimension = fresh.dimension
+                self.trained_on = fresh.trained_on
+                self.hashes = fresh.hashes
+                self.rows = fresh.rows
+                self.row_of = fresh.row_of
+                self.tombstones = fresh.tombstones
+                self._tombstone_selector = None
+                self.attributes = fresh.attributes
+                self.keywords = fresh.keywords
+                self.watermark = fresh.watermark
+                self.embedded += fresh.embedded
+            self.save()
+        return {"count": len(self.hashes), "seconds": time.perf_counter() - started}
+
+    def mark_changed(self, complaint_id: int):
+        with self._lock:
+            self._changed.add(complaint_id)
+
+    def mark_deleted(self, complaint_id: int):
+        with self._lock:
+            self._deleted.add(complaint_id)
+
+    def sync(self, force: bool = False):
+        """Bring the index up to date with the complaints table"""
+        if not self._sync_lock.acquire(blocking=force):
+            return
+        try:
+            self._sync(force)
+        finally:
+            self._sync_lock.release()
+
+    def _sync(self, force: bool):
+        with self._lock:
+            due = force or self._changed or self._deleted or time.monotonic() - self._last_sync >= settings.VECTOR_INDEX_SYNC_SECONDS
+            if not due:
+                return
+            deleted, self._deleted = self._deleted, set()
+            self._changed = set()
+            self._last_sync = time.monotonic()
+
+        self._remove(list(deleted))
+
+        db = SessionLocal()
+        try:
+            # Rows touched since the last sync; >= so rows sharing the watermark's timestamp
+            # are not missed, unchanged texts are skipped by their hash anyway
+            query = db.query(
+                Complaint.id, Complaint.complaint_text, Complaint.updated_at,
+                Complaint.category, Complaint.urgency, Complaint.status, Complaint.created_at
+            )
+            if self.watermark is not None:
+                query = query.filter(Complaint.updated_at >= self.watermark)
+            rows = query.order_by(Complaint.id).all()
+            if rows:
+                self._upsert([row.id for row in rows], [str(row.complaint_text) for row in rows])
+                # Status and label edits touch updated_at too, so this also keeps filters current
+                self._set_attributes(rows)
+                self.keywords.add_many((row.id, str(row.complaint_text)) for row in rows)
+                stamps = [row.updated_at for row in rows if row.updated_at is not None]
+                if stamps:
+                    with self._lock:
+                        self.watermark = max(stamps + ([self.watermark] if self.watermark else []))
+
+            # Deletes made by other workers, or outside the API, only show up as a count mismatch
+            if db.query(func.count(Complaint.id)).scalar() != len(self.hashes):
+                existing = {row.id for row in db.query(Complaint.id).all()}
+                self._remove([i for i in list(self.hashes) if i not in existing])
+        finally:
+            db.close()
+
+        if (self.tombstones and not self._compacting
+                and len(self.tombstones) > settings.VECTOR_INDEX_HNSW_MAX_TOMBSTONE_RATIO * self.index.ntotal):
+            # Rebuilding the graph takes minutes on a large archive, far too long for the
+            # search that happened to trigger this sync
+            self._compacting = True
+            threading.Thread(target=self._compact_in_background, name="vector-index-compaction", daemon=True).start()
+
+        if self._dirty and time.monotonic() - self._last_save >= settings.VECTOR_INDEX_SAVE_SECONDS:
+            self.save()
+
+    def _selector(self):
+        if not self.tombstones:
+            return None
+        if self._tombstone_selector is None:
+            rows = np.array(sorted(self.tombstones), dtype=np.int64)
+            self._tombstone_selector = faiss.IDSelectorNot(faiss.IDSelectorBatch(len(rows), faiss.swig_ptr(rows)))
+        return self._tombstone_selector
+
+    def count_matching(self, filters: Optional[ComplaintSearchFilters] = None) -> int:
+        with self._lock:
+            if not has_filters(filters):
+                return len(self.hashes)
+            return int(self.attributes.mask(filters).sum())
+
+    def _exact_subset_search(self, vector: np.ndarray, labels: np.ndarray, k: int):
+        """Score every label in the subset directly; HNSW keeps its vectors, so nothing is re-embedded"""
+        scores = self.index.reconstruct_batch(labels) @ vector[0]
+        top = np.argsort(-scores)[:k]
+        return scores[top][None, :], labels[top][None, :]
+
+    def _filtered_search(self, vector: np.ndarray, k: int, mask: np.ndarray):
+        """Search only the labels set in mask, returning min(k, matching) hits.
+
+        The mask becomes a faiss bitmap selector, so non-matching vectors are skipped inside the
+        search instead of being filtered out of a top-k afterwards. An approximate pass can
+        still come up short when few vectors match: IVF then probes every list, and HNSW scores
+        small subsets exactly instead of walking a sparse graph.
+        """
+        matching = int(mask.sum())
+        k = min(k, matching)
+        if k == 0:
+            return np.zeros((1, 0), dtype=np.float32), np.zeros((1, 0), dtype=np.int64)
+        if self.index_type == "hnsw" and matching <= settings.VECTOR_INDEX_FILTER_EXACT_MAX:
+            return self._exact_subset_search(vector, np.flatnonzero(mask), k)
+
+        bitmap = np.packbits(mask, bitorder="little")
+        selector = faiss.IDSelectorBitmap(len(bitmap), faiss.swig_ptr(bitmap))
+        scores, labels = self.index.search(vector, k, params=search_parameters(self.index_type, selector))
+        if (labels[0] != -1).sum() < k:
+            if self.index_type == "ivf":
+                params = search_parameters("ivf", selector, nprobe=self.index.nlist)
+                scores, labels = self.index.search(vector, k, params=params)
+            elif self.index_type == "hnsw":
+                scores, labels = self._exact_subset_search(vector, np.flatnonzero(mask), k)
+        return scores, labels
+
+    def search(self, query: str, k: int = 5, filters: Optional[ComplaintSearchFilters] = None) -> List[Tuple[int, float]]:
+        """Ids and cosine similarities of the k nearest complaints, among those matching filters if given"""
+        self.sync()
+        vector = normalize_rows(np.asarray([self.embeddings.embed_query(query)], dtype=np.float32))
+        with self._lock:
+            if self.index is None or not self.hashes:
+                return []
+            if has_filters(filters):
+                scores, labels = self._filtered_search(vector, k, self.attributes.mask(filters))
+            else:
+                params = search_parameters(self.index_type, self._selector())
+                scores, labels = self.index.search(vector, min(k, len(self.hashes)), params=params)
+            hits = [(int(label), float(score)) for label, score in zip(labels[0], scores[0]) if label != -1]
+            if self.index_type == "hnsw":
+                hits = [(self.rows[row], score) for row, score in hits]
+        return hits
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        k: int = 5,
+        filters: Optional[ComplaintSearchFilters] = None
+    ) -> List[Tuple[Document, float]]:
+        return self._documents(self.search(query, k, filters))
+
+    def _documents(self, hits: List[Tuple[int, float]]) -> List[Tuple[Document, float]]:
+        if not hits:
+            return []
+
+        # Text and metadata come from the table, so status changes show up immediately
+        db = SessionLocal()
+        try:
+            complaints = {c.id: c for c in db.query(Complaint).filter(Complaint.id.in_([i for i, _ in hits])).all()}
+            return [
+                (complaint_document(complaints[i], score), score)
+                for i, score in hits if i in complaints
+            ]
+        finally:
+            db.close()
+
+    def _allowed(self, filters: Optional[ComplaintSearchFilters]):
+        """Membership test on complaint ids for the keyword index, from the same bitmap as vector filtering"""
+        if not has_filters(filters):
+            return None
+        with self._lock:
+            mask = self.attributes.mask(filters)
+            label = self._label
+
+            def allowed(complaint_id: int) -> bool:
+                i = label(complaint_id)
+                return i is not None and i < len(mask) and bool(mask[i])
+        return allowed
+
+    def hybrid_search(
+        self,
+        query: str,
+        k: int = 5,
+        filters: Optional[ComplaintSearchFilters] = None
+    ) -> Tuple[List[Tuple[int, float]], Dict[int, int], Dict[int, int]]:
+        """Vector and BM25 candidates fused by reciprocal rank fusion.
+
+        Embeddings find paraphrases, BM25 finds exact identifiers such as course codes and room
+        numbers; RRF only looks at ranks, so neither side's score scale has to be calibrated.
+        Returns the fused (id, score) hits and each retriever's 1-based rank per id.
+        """
+        candidates = max(k, settings.HYBRID_SEARCH_CANDIDATES)
+        vector_hits = self.search(query, candidates, filters)
+        keyword_hits = self.keywords.search(query, candidates, self._allowed(filters))
+        vector_ids = [i for i, _ in vector_hits]
+        keyword_ids = [i for i, _ in keyword_hits]
+        fused = reciprocal_rank_fusion([vector_ids, keyword_ids], k, settings.HYBRID_RRF_K)
+        vector_ranks = {i: rank for rank, i in enumerate(vector_ids, start=1)}
+        keyword_ranks = {i: rank for rank, i in enumerate(keyword_ids, start=1)}
+        return fused, vector_ranks, keyword_ranks
+
+    def hybrid_search_with_score(
+        self,
+        query: str,
+        k: int = 5,
+        filters: Optional[ComplaintSearchFilters] = None
+    ) -> List[Tuple[Document, float]]:
+        fused, vector_ranks, keyword_ranks = self.hybrid_search(query, k, filters)
+        results = self._documents(fused)
+        for doc, _ in results:
+            doc.metadata["vector_rank"] = vector_ranks.get(doc.metadata["id"])
+            doc.metadata["keyword_rank"] = keyword_ranks.get(doc.metadata["id"])
+        return results
+
+    def similarity_search(self, query: str, k: int = 5, filters: Optional[ComplaintSearchFilters] = None) -> List[Document]:
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, filters)]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "model_name": self.model_name,
+                "index_type": self.index_type,
+                "dimension": self.dimension,
+                "count": len(self.hashes),
+                "vectors": self.index.ntotal if self.index is not None else 0,
+                "nlist": self.index.nlist if self.index_type == "ivf" and self.index is not None else None,
+                "trained_on": self.trained_on or None,
+                "tombstones": len(self.tombstones),
+                "keyword_index": self.keywords.stats(),
+                "watermark": self.watermark.isoformat() if self.watermark else None,
+                "embedded_since_start": self.embedded,
+                "unsaved_changes": self._dirty,
+                "index_dir": str(self.index_dir),
+            }
+
+
+# Singleton instance
+complaint_index: Optional[ComplaintVectorIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_complaint_index() -> ComplaintVectorIndex:
+    """Load the complaint index once per process, building it on first use if none is saved"""
+    global complaint_index
+    if complaint_index is None:
+        with _index_lock:
+            if complaint_index is None:
+                from app.chatbot.embeddings import get_embeddings, get_embedding_model_name
+
+                index = ComplaintVectorIndex(
+                    get_embeddings(),
+                    get_embedding_model_name(),
+                    settings.VECTOR_INDEX_DIR,
+                    settings.VECTOR_INDEX_TYPE
+                )
+                if not index.load():
+                    index.rebuild()
+                complaint_index = index
+    return complaint_index
+
+
+def notify_complaint_changed(complaint_id: int):
+    """Make the next search pick up a created or edited complaint without waiting for the sync interval"""
+    if complaint_index is not None:
+        complaint_index.mark_changed(complaint_id)
+
+
+def notify_complaint_deleted(complaint_id: int):
+    if complaint_index is not None:
+        complaint_index.mark_deleted(complaint_id)
+
+
+def save_complaint_index():
+    if complaint_index is not None and complaint_index._dirty:
+        complaint_index.save()
@@ -20,9 +20,154 @@ class Settings(BaseSettings):
     # Google Gemini API
     GOOGLE_API_KEY: Optional[SecretStr] = None
     
+    # Embeddings for chatbot search: "google" calls the Gemini embedding API, "local" runs the
+    # sentence-transformers LOCAL_EMBEDDING_MODEL on this machine in batches of
+    # EMBEDDING_BATCH_SIZE over at most EMBEDDING_WORKERS threads
+    EMBEDDING_BACKEND: str = "google"
+    LOCAL_EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
+    EMBEDDING_BATCH_SIZE: int = 64
+    EMBEDDING_WORKERS: int = 2
+    EMBEDDING_DEVICE: str = "cpu"
+    # Reuse document vectors stored in the text_embeddings table, keyed by text hash and model
+    EMBEDDING_CACHE_ENABLED: bool = True
+    
+    # Chatbot vector index: complaint vectors keyed by complaint id, persisted in VECTOR_INDEX_DIR.
+    # Searches re-sync changed complaints at most every VECTOR_INDEX_SYNC_SECONDS and the index
+    # is written back at most every VECTOR_INDEX_SAVE_SECONDS
+    VECTOR_INDEX_DIR: str = "data/vector_index"
+    VECTOR_INDEX_SYNC_SECONDS: float = 2.0
+    VECTOR_INDEX_SAVE_SECONDS: float = 30.0
+    VECTOR_INDEX_EMBED_BATCH_SIZE: int = 512
+    # Index type: flat (exact), ivf or hnsw (approximate, for large archives). Changing it rebuilds
+    # the index. IVF trains on up to VECTOR_INDEX_TRAIN_SAMPLE complaints with NLIST lists
+    # (0 = about 4 * sqrt(n)) and scans NPROBE of them per query; HNSW builds an M-link graph and
+    # explores EF_SEARCH candidates per query, compacting once more than MAX_TOMBSTONE_RATIO of
+    # its rows belong to edited or deleted complaints. NPROBE and EF_SEARCH apply without a rebuild
+    VECTOR_INDEX_TYPE: str = "flat"
+    VECTOR_INDEX_TRAIN_SAMPLE: int = 100000
+    VECTOR_INDEX_IVF_NLIST: int = 0
+    VECTOR_INDEX_IVF_NPROBE: int = 16
+    VECTOR_INDEX_HNSW_M: int = 32
+    VECTOR_INDEX_HNSW_EF_CONSTRUCTION: int = 200
+    VECTOR_INDEX_HNSW_EF_SEARCH: int = 64
+    VECTOR_INDEX_HNSW_MAX_TOMBSTONE_RATIO: float = 0.2
+    # Filtered searches on HNSW score matching subsets up to this size exactly instead of walking the graph
+    VECTOR_INDEX_FILTER_EXACT_MAX: int = 10000
+    # Hybrid search fuses the top HYBRID_SEARCH_CANDIDATES of vector and BM25 retrieval with
+    # reciprocal rank fusion (1 / (HYBRID_RRF_K + rank)); the chatbot search tool uses
+    # CHATBOT_SEARCH_MODE, hybrid or vector
+    HYBRID_SEARCH_CANDIDATES: int = 50
+    HYBRID_RRF_K: int = 60
+    CHATBOT_SEARCH_MODE: str = "hybrid"
+    
     # ML Model Settings
     MODEL_PATH: str = "model/model.pt"
     MODEL: str = 'roberta-base'
+    # Complaints are truncated to this many tokens before classification
+    INFERENCE_MAX_LENGTH: int = 512
+    
+    # Cheap-first cascade: the TF-IDF model at CASCADE_MODEL_PATH answers when both of its
+    # confidences reach the thresholds, otherwise the full model runs
+    CASCADE_ENABLED: bool = False
+    CASCADE_MODEL_PATH: str = "model/cascade.joblib"
+    CASCADE_CATEGORY_THRESHOLD: float = 0.9
+    CASCADE_URGENCY_THRESHOLD: float = 0.9
+    
+    # Load the model and run MODEL_WARMUP_BATCHES dummy batches when the app starts
+    MODEL_WARMUP_ON_STARTUP: bool = False
+    MODEL_WARMUP_BATCHES: int = 3
+    
+    # Hot reload: a new checkpoint is loaded and warmed next to the live one, scored on
+    # MODEL_RELOAD_HOLDOUT_SAMPLES labelled complaints and swapped in only if both accuracies
+    # reach MODEL_RELOAD_MIN_ACCURACY and neither drops more than MODEL_RELOAD_MAX_ACCURACY_DROP
+    # below the live model. The replaced model is closed MODEL_RELOAD_DRAIN_SECONDS later.
+    # With MODEL_RELOAD_WATCH, each worker polls its checkpoint file and reloads when it changes.
+    # MODEL_RELOAD_HOLDOUT_SPLIT keeps only the training notebook's validation split of the CSV;
+    # turn it off when MODEL_RELOAD_HOLDOUT_CSV is a separate holdout set.
+    MODEL_RELOAD_WATCH: bool = False
+    MODEL_RELOAD_WATCH_INTERVAL_SECONDS: float = 30.0
+    MODEL_RELOAD_HOLDOUT_CSV: str = "data/complaints.csv"
+    MODEL_RELOAD_HOLDOUT_SAMPLES: int = 200
+    MODEL_RELOAD_HOLDOUT_SPLIT: bool = True
+    MODEL_RELOAD_MIN_ACCURACY: float = 0.5
+    MODEL_RELOAD_MAX_ACCURACY_DROP: float = 0.02
+    MODEL_RELOAD_DRAIN_SECONDS: float = 30.0
+    
+    # Inference backend: "torch" runs the checkpoint at MODEL_PATH eagerly, "quantized" runs it
+    # with int8 dynamic quantization on CPU, "onnx" runs the exported graph at ONNX_MODEL_PATH
+    # with label encoders read from labels.json beside the model file (LABELS_PATH if there is
+    # none; safetensors checkpoints too), and "pool" sends texts to the shared inference
+    # pool started with scripts/inference_server.py
+    INFERENCE_BACKEND: str = "torch"
+    # "compiled" runs the torch checkpoint with fused SDPA attention through torch.compile under
+    # inference_mode; inputs are padded up to the next INFERENCE_COMPILE_BUCKETS length so each
+    # bucket compiles once, and it falls back to eager execution if compilation fails (and to
+    # eager attention if the encoder or transformers version has no SDPA support)
+    INFERENCE_COMPILE_BUCKETS: List[int] = [16, 32, 64, 128, 256, 512]
+    INFERENCE_COMPILE_MODE: str = "default"
+    ONNX_MODEL_PATH: str = "model/model.onnx"
+    ONNX_INTRA_OP_THREADS: int = 0
+    LABELS_PATH: str = "model/labels.json"
+    
+    # Shared inference pool: INFERENCE_POOL_BACKEND is what the pool itself runs, split over
+    # INFERENCE_POOL_WORKERS forked processes (threads per worker default to cores / workers).
+    # The address is a unix socket path or host:port; the pool and the API refuse to start
+    # until INFERENCE_POOL_AUTHKEY is changed from the placeholder
+    INFERENCE_POOL_ADDRESS: str = "data/inference-pool.sock"
+    INFERENCE_POOL_AUTHKEY: SecretStr = SecretStr("CHANGE_THIS_POOL_AUTHKEY")
+    INFERENCE_POOL_BACKEND: str = "torch"
+    INFERENCE_POOL_WORKERS: int = 2
+    INFERENCE_POOL_THREADS_PER_WORKER: int = 0
+    # A worker that takes longer than this on one batch is killed and replaced; callers get an error
+    INFERENCE_POOL_TIMEOUT_SECONDS: float = 30.0
+    
+    # Inference batching: concurrent predictions wait up to INFERENCE_BATCH_MAX_WAIT_MS
+    # to be grouped into a single forward pass of at most INFERENCE_BATCH_MAX_SIZE texts
+    INFERENCE_BATCHING: bool = False
+    INFERENCE_BATCH_MAX_SIZE: int = 16
+    INFERENCE_BATCH_MAX_WAIT_MS: float = 5.0
+    
+    # Bulk classification: texts are length-sorted and run in chunks of INFERENCE_BATCH_CHUNK_SIZE
+    INFERENCE_BATCH_CHUNK_SIZE: int = 32
+    CLASSIFY_BATCH_MAX_TEXTS: int = 1000
+    
+    # Model calls from async code run on a dedicated pool of INFERENCE_MAX_CONCURRENCY threads;
+    # single predictions slower than INFERENCE_TIMEOUT_SECONDS fall back to the default prediction.
+    # Beyond INFERENCE_MAX_PENDING single predictions waiting or running, requests get a 503 (0 = no limit).
+    # Batch classification runs on its own INFERENCE_BATCH_CONCURRENCY threads and is rejected beyond that
+    INFERENCE_MAX_CONCURRENCY: int = 2
+    INFERENCE_TIMEOUT_SECONDS: float = 10.0
+    INFERENCE_MAX_PENDING: int = 16
+    INFERENCE_BATCH_CONCURRENCY: int = 1
+    
+    # Intake classification: "sync" classifies in POST /complaints/, "async" stores complaints
+    # as classification_pending and lets CLASSIFICATION_WORKERS background threads label them
+    CLASSIFICATION_MODE: str = "sync"
+    CLASSIFICATION_WORKERS: int = 1
+    CLASSIFICATION_BATCH_SIZE: int = 32
+    CLASSIFICATION_POLL_SECONDS: float = 5.0
+    
+    # Keep the classifier's pooled [CLS] vector with each new complaint (float16) so EDA
+    # clustering and similarity features can reuse it without a second model pass
+    STORE_COMPLAINT_EMBEDDINGS: bool = False
+    
+    # Shadow evaluation: SHADOW_SAMPLE_RATE of classified complaints are also run through the
+    # model at SHADOW_MODEL_PATH (with SHADOW_BACKEND) in a separate low-priority process per
+    # worker, and its latency and agreement with the live model are reported at GET /ml/shadow
+    SHADOW_ENABLED: bool = False
+    SHADOW_MODEL_PATH: str = "model/candidate.pt"
+    SHADOW_BACKEND: str = "torch"
+    SHADOW_SAMPLE_RATE: float = 0.1
+    SHADOW_QUEUE_SIZE: int = 1000
+    SHADOW_THREADS: int = 1
+    
+    # Per-stage timing, token count and batch size histograms, readable at GET /ml/metrics
+    INFERENCE_METRICS_ENABLED: bool = True
+    
+    # Prediction cache keyed by normalized text and model fingerprint
+    PREDICTION_CACHE_ENABLED: bool = True
+    PREDICTION_CACHE_MAX_SIZE: int = 10000
+    PREDICTION_CACHE_TTL_SECONDS: float = 3600.0
     
     class Config:
         case_sensitive = True
@@ -0,0 +1,61 @@
+from typing import List
+
+from sqlalchemy import inspect, text
+
+from app.db.database import Base
+# Registers the tables whose columns are upgraded below
+from app.models.domain import complaint  # noqa: F401
+
+# Columns added to existing tables since their first release, with the DDL suffix each needs
+# (create_all creates missing tables but never alters existing ones)
+ADDED_COLUMNS = {
+    "complaints": [
+        ("classification_pending", "NOT NULL DEFAULT FALSE"),
+        ("embedding", ""),
+        ("embedding_version", ""),
+        ("labels_edited", "NOT NULL DEFAULT FALSE"),
+    ],
+}
+
+# (index name, table, column) for indexes on the added or existing columns
+ADDED_INDEXES = [
+    ("ix_complaints_classification_pending", "complaints", "classification_pending"),
+    ("ix_complaints_updated_at", "complaints", "updated_at"),
+]
+
+
+def missing_columns(engine) -> List[str]:
+    """'table.column' for every added column an existing table still lacks, without changing anything"""
+    inspector = inspect(engine)
+    missing = []
+    for table_name, columns in ADDED_COLUMNS.items():
+        if not inspector.has_table(table_name):
+            continue
+        existing = {column["name"] for column in inspector.get_columns(table_name)}
+        missing.extend(f"{table_name}.{name}" for name, _ in columns if name not in existing)
+    return missing
+
+
+def upgrade_schema(engine):
+    """Add missing columns and indexes to tables created by an older version; safe to run on every start"""
+    inspector = inspect(engine)
+    with engine.begin() as connection:
+        for table_name, columns in ADDED_COLUMNS.items():
+            if not inspector.has_table(table_name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table_name)}
+            table = Base.metadata.tables[table_name]
+            for name, suffix in columns:
+                if name in existing:
+                    continue
+                column_type = table.c[name].type.compile(dialect=engine.dialect)
+                connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {name} {column_type} {suffix}".rstrip()))
+                print(f"Added column {table_name}.{name}")
+
+        for index_name, table_name, column in ADDED_INDEXES:
+            if not inspector.has_table(table_name):
+                continue
+            if index_name in {index["name"] for index in inspector.get_indexes(table_name)}:
+                continue
+            connection.execute(text(f"CREATE INDEX {index_name} ON {table_name} ({column})"))
+            print(f"Added index {index_name}")
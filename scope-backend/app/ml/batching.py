@@ -0,0 +1,140 @@
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+class _PendingRequest:
+    __slots__ = ("text", "future", "enqueued_at")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class MicroBatcher:
+    """Collect concurrent predictions into padded batches for a single forward pass"""
+
+    def __init__(
+        self,
+        forward_fn: Callable[[List[str]], List[Dict[str, Any]]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        stats_window: int = 1024,
+    ):
+        self.forward_fn = forward_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+
+        self._queue: "queue.Queue[Optional[_PendingRequest]]" = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._batch_sizes: Counter = Counter()
+        self._recent_waits_ms: Deque[float] = deque(maxlen=stats_window)
+        self._total_batches = 0
+        self._total_requests = 0
+        self._total_wait_ms = 0.0
+        self._max_wait_ms = 0.0
+
+        self._thread = threading.Thread(target=self._loop, name="inference-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        """Queue a text for the next batch and return a future for its prediction"""
+        request = _PendingRequest(text)
+        self._queue.put(request)
+        return request.future
+
+    def predict(self, text: str) -> Dict[str, Any]:
+        """Blocking helper that waits for the batched prediction of a single text"""
+        return self.submit(text).result()
+
+    def close(self):
+        """Stop the scheduler once everything already queued has been served"""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _loop(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+
+            # The first request bounds how long the whole batch may wait
+            batch = [first]
+            deadline = first.enqueued_at + self.max_wait
+            stop = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._run_batch(batch)
+            if stop:
+                return
+
+    def _run_batch(self, batch: List[_PendingRequest]):
+        started = time.perf_counter()
+        self._record(batch, started)
+
+        try:
+            results = list(self.forward_fn([request.text for request in batch]))
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        for request, result in zip(batch, results):
+            request.future.set_result(result)
+        # A short result list must not leave callers waiting forever
+        if len(results) != len(batch):
+            error = RuntimeError(f"Batch forward returned {len(results)} results for {len(batch)} texts")
+            for request in batch[len(results):]:
+                request.future.set_exception(error)
+
+    def _record(self, batch: List[_PendingRequest], started: float):
+        waits = [(started - request.enqueued_at) * 1000.0 for request in batch]
+        with self._stats_lock:
+            self._total_batches += 1
+            self._total_requests += len(batch)
+            self._batch_sizes[len(batch)] += 1
+            self._total_wait_ms += sum(waits)
+            self._max_wait_ms = max(self._max_wait_ms, max(waits))
+            self._recent_waits_ms.extend(waits)
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch-size and queue-wait statistics since the scheduler started"""
+        with self._stats_lock:
+            recent = sorted(self._recent_waits_ms)
+            batches = self._total_batches
+            requests = self._total_requests
+
+            def percentile(p: float) -> float:
+                if not recent:
+                    return 0.0
+                return recent[min(len(recent) - 1, int(p * len(recent)))]
+
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000.0,
+                "queue_depth": self._queue.qsize(),
+                "total_batches": batches,
+                "total_requests": requests,
+                "mean_batch_size": requests / batches if batches else 0.0,
+                "batch_size_histogram": {str(size): count for size, count in sorted(self._batch_sizes.items())},
+                "queue_wait_ms": {
+                    "mean": self._total_wait_ms / requests if requests else 0.0,
+                    "max": self._max_wait_ms,
+                    "p50": percentile(0.50),
+                    "p95": percentile(0.95),
+                    "p99": percentile(0.99),
+                },
+            }
@@ -0,0 +1,94 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+
+
+class CascadeClassifier:
+    """Cheap TF-IDF + linear first stage that answers the easy complaints before RoBERTa runs"""
+
+    def __init__(self, vectorizer: TfidfVectorizer, category_model: LogisticRegression, urgency_model: LogisticRegression):
+        self.vectorizer = vectorizer
+        self.category_model = category_model
+        self.urgency_model = urgency_model
+
+    @classmethod
+    def train(cls, texts: List[str], categories: List[str], urgencies: List[str]) -> "CascadeClassifier":
+        vectorizer = TfidfVectorizer(ngram_range=(1, 2), min_df=2, sublinear_tf=True, max_features=50000)
+        features = vectorizer.fit_transform(texts)
+        category_model = LogisticRegression(max_iter=1000, C=5.0).fit(features, categories)
+        urgency_model = LogisticRegression(max_iter=1000, C=5.0).fit(features, urgencies)
+        return cls(vectorizer, category_model, urgency_model)
+
+    def predict(self, texts: List[str]) -> List[Dict[str, Any]]:
+        features = self.vectorizer.transform(texts)
+        category_probs = self.category_model.predict_proba(features)
+        urgency_probs = self.urgency_model.predict_proba(features)
+        category_idx = category_probs.argmax(axis=1)
+        urgency_idx = urgency_probs.argmax(axis=1)
+
+        return [
+            {
+                "category": str(self.category_model.classes_[category_idx[i]]),
+                "urgency": str(self.urgency_model.classes_[urgency_idx[i]]),
+                "confidence_category": float(category_probs[i, category_idx[i]]),
+                "confidence_urgency": float(urgency_probs[i, urgency_idx[i]]),
+                "stage": "cascade",
+            }
+            for i in range(len(texts))
+        ]
+
+    def save(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump({
+            "vectorizer": self.vectorizer,
+            "category_model": self.category_model,
+            "urgency_model": self.urgency_model,
+        }, path)
+        return path
+
+    @classmethod
+    def load(cls, path) -> "CascadeClassifier":
+        path = Path(path)
+        if not path.exists():
+            raise FileNotFoundError(f"Cascade model not found at {path}. Train it with scripts/train_cascade.py")
+        parts = joblib.load(path)
+        return cls(parts["vectorizer"], parts["category_model"], parts["urgency_model"])
+
+
+def split_confident(
+    predictions: List[Dict[str, Any]],
+    category_threshold: float,
+    urgency_threshold: float
+) -> List[Optional[Dict[str, Any]]]:
+    """Keep predictions confident on both heads, None where the full model has to run"""
+    return [
+        p if p["confidence_category"] >= category_threshold and p["confidence_urgency"] >= urgency_threshold else None
+        for p in predictions
+    ]
+
+
+def coverage_report(
+    predictions: List[Dict[str, Any]],
+    categories: List[str],
+    urgencies: List[str],
+    thresholds: List[float]
+) -> List[Dict[str, float]]:
+    """How many texts the cascade would answer at each threshold, and how accurately"""
+    report = []
+    for threshold in thresholds:
+        answered = [
+            (p, c, u) for p, c, u in zip(predictions, categories, urgencies)
+            if p["confidence_category"] >= threshold and p["confidence_urgency"] >= threshold
+        ]
+        report.append({
+            "threshold": threshold,
+            "coverage": len(answered) / len(predictions) if predictions else 0.0,
+            "category_accuracy": float(np.mean([p["category"] == c for p, c, _ in answered])) if answered else 0.0,
+            "urgency_accuracy": float(np.mean([p["urgency"] == u for p, _, u in answered])) if answered else 0.0,
+        })
+    return report
@@ -0,0 +1,106 @@
+import bisect
+import threading
+from typing import List
+
+import torch
+import torch.nn.functional as F
+
+from app.ml.metrics import get_inference_metrics
+
+
+class CompiledModelRunner:
+    """Run a MultiTaskModel through torch.compile with inputs padded to fixed length buckets.
+
+    Every distinct sequence length would otherwise trigger a recompile, so inputs are padded
+    up to the next bucket and only the batch dimension is left dynamic. The first call of each
+    shape compiles behind a lock, so executor threads don't race each other into dynamo. If
+    compilation or a compiled call fails, the runner switches to the eager model for good.
+    """
+
+    def __init__(self, model, buckets: List[int], pad_token_id: int, mode: str = "default", attention: str = "sdpa"):
+        self.eager = model
+        self.buckets = sorted(set(buckets))
+        self.pad_token_id = pad_token_id
+        self.mode = mode
+        self.attention = attention
+        self.error = None
+        # (bucket length, batched) shapes that have already been compiled
+        self._compiled_shapes = set()
+        self._compile_lock = threading.Lock()
+
+        # Each bucket compiles separately for batch size 1 and for larger batches
+        torch._dynamo.config.cache_size_limit = max(torch._dynamo.config.cache_size_limit, 2 * len(self.buckets) + 4)
+        try:
+            self.compiled = torch.compile(model, mode=mode)
+        except Exception as e:
+            self._fall_back(e)
+
+    def _fall_back(self, error: Exception):
+        print(f"torch.compile failed, falling back to eager inference: {error}")
+        self.compiled = None
+        self.error = str(error)
+
+    def bucket_length(self, length: int) -> int:
+        index = bisect.bisect_left(self.buckets, length)
+        return self.buckets[index] if index < len(self.buckets) else length
+
+    def _pad(self, input_ids, attention_mask):
+        padding = self.bucket_length(input_ids.shape[1]) - input_ids.shape[1]
+        if padding > 0:
+            # Padded positions are masked out, so the [CLS] vector and logits don't change
+            input_ids = F.pad(input_ids, (0, padding), value=self.pad_token_id)
+            attention_mask = F.pad(attention_mask, (0, padding), value=0)
+        if input_ids.shape[0] > 1:
+            torch._dynamo.mark_dynamic(input_ids, 0)
+            torch._dynamo.mark_dynamic(attention_mask, 0)
+        return input_ids, attention_mask
+
+    def __call__(self, input_ids, attention_mask, token_type_ids=None, return_embedding=False):
+        if self.compiled is not None:
+            input_ids, attention_mask = self._pad(input_ids, attention_mask)
+            get_inference_metrics().observe_size("compiled_bucket_length", input_ids.shape[1])
+            shape = (input_ids.shape[1], input_ids.shape[0] > 1)
+            if shape in self._compiled_shapes:
+                result = self._run_compiled(input_ids, attention_mask, return_embedding)
+            else:
+                with self._compile_lock:
+                    result = self._run_compiled(input_ids, attention_mask, return_embedding)
+                    if result is not None:
+                        self._compiled_shapes.add(shape)
+            if result is not None:
+                return result
+        return self.eager(input_ids, attention_mask, return_embedding=return_embedding)
+
+    def _run_compiled(self, input_ids, attention_mask, return_embedding):
+        """Compiled forward pass, or None once compilation has been given up on"""
+        compiled = self.compiled
+        if compiled is None:
+            return None
+        try:
+            return compiled(input_ids, attention_mask, return_embedding=return_embedding)
+        except Exception as e:
+            self._fall_back(e)
+            return None
+
+    def warmup_shapes(self, max_length: int, batch_size: int = 8, return_embedding: bool = False):
+        """Compile every bucket up to max_length before real traffic arrives"""
+        for length in [b for b in self.buckets if b <= max_length]:
+            for size in (1, batch_size):
+                input_ids = torch.full((size, length), self.pad_token_id, dtype=torch.long, device=self.device)
+                attention_mask = torch.ones((size, length), dtype=torch.long, device=self.device)
+                with torch.inference_mode():
+                    self(input_ids, attention_mask, return_embedding=return_embedding)
+
+    @property
+    def device(self):
+        return next(self.eager.parameters()).device
+
+    def stats(self):
+        return {
+            "compiled": self.compiled is not None,
+            "mode": self.mode,
+            "attention": self.attention,
+            "buckets": self.buckets,
+            "compiled_shapes": sorted(self._compiled_shapes),
+            "error": self.error,
+        }
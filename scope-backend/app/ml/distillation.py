@@ -0,0 +1,144 @@
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import torch
+import torch.nn.functional as F
+from sklearn.preprocessing import LabelEncoder
+from transformers import AutoConfig, AutoTokenizer, get_linear_schedule_with_warmup
+
+from app.ml.model import MultiTaskModel
+
+
+def teacher_logits(
+    model,
+    tokenizer,
+    texts: List[str],
+    batch_size: int = 32,
+    max_length: int = 128,
+    device=None
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """Category and urgency logits of the teacher for every text, computed once up front"""
+    device = device or torch.device('cpu')
+    category_logits, urgency_logits = [], []
+    with torch.inference_mode():
+        for start in range(0, len(texts), batch_size):
+            inputs = tokenizer(
+                texts[start:start + batch_size],
+                return_tensors="pt",
+                truncation=True,
+                padding=True,
+                max_length=max_length
+            ).to(device)
+            cat, urg = model(inputs["input_ids"], inputs["attention_mask"])
+            category_logits.append(cat.float().cpu())
+            urgency_logits.append(urg.float().cpu())
+    return torch.cat(category_logits), torch.cat(urgency_logits)
+
+
+def distillation_loss(
+    student_logits: torch.Tensor,
+    teacher_logits: torch.Tensor,
+    labels: torch.Tensor,
+    temperature: float = 2.0,
+    alpha: float = 0.7
+) -> torch.Tensor:
+    """Blend of KL divergence to the teacher's softened distribution and cross entropy on the labels"""
+    soft = F.kl_div(
+        F.log_softmax(student_logits / temperature, dim=-1),
+        F.softmax(teacher_logits / temperature, dim=-1),
+        reduction="batchmean"
+    ) * temperature ** 2
+    hard = F.cross_entropy(student_logits, labels)
+    return alpha * soft + (1 - alpha) * hard
+
+
+def train_student(
+    student_name: str,
+    texts: List[str],
+    category_ids: List[int],
+    urgency_ids: List[int],
+    soft_labels: Tuple[torch.Tensor, torch.Tensor],
+    num_genres: int,
+    num_priority: int,
+    epochs: int = 3,
+    batch_size: int = 16,
+    learning_rate: float = 5e-5,
+    temperature: float = 2.0,
+    alpha: float = 0.7,
+    max_length: int = 128,
+    device=None,
+    seed: int = 42
+) -> MultiTaskModel:
+    """Fine-tune a smaller pretrained encoder with the same two heads on the teacher's soft labels"""
+    device = device or torch.device('cpu')
+    torch.manual_seed(seed)
+
+    tokenizer = AutoTokenizer.from_pretrained(student_name)
+    model = MultiTaskModel(num_genres, num_priority, pretrained=student_name).to(device)
+    teacher_cat, teacher_urg = soft_labels
+    category_ids = torch.tensor(category_ids)
+    urgency_ids = torch.tensor(urgency_ids)
+
+    steps_per_epoch = (len(texts) + batch_size - 1) // batch_size
+    optimizer = torch.optim.AdamW(model.parameters(), lr=learning_rate)
+    scheduler = get_linear_schedule_with_warmup(
+        optimizer,
+        num_warmup_steps=steps_per_epoch // 10,
+        num_training_steps=steps_per_epoch * epochs
+    )
+
+    for epoch in range(epochs):
+        model.train()
+        order = torch.randperm(len(texts))
+        total_loss = 0.0
+        for start in range(0, len(texts), batch_size):
+            index = order[start:start + batch_size]
+            inputs = tokenizer(
+                [texts[i] for i in index.tolist()],
+                return_tensors="pt",
+                truncation=True,
+                padding=True,
+                max_length=max_length
+            ).to(device)
+
+            optimizer.zero_grad()
+            cat, urg = model(inputs["input_ids"], inputs["attention_mask"])
+            loss = (
+                distillation_loss(cat, teacher_cat[index].to(device), category_ids[index].to(device), temperature, alpha)
+                + distillation_loss(urg, teacher_urg[index].to(device), urgency_ids[index].to(device), temperature, alpha)
+            )
+            loss.backward()
+            optimizer.step()
+            scheduler.step()
+            total_loss += loss.item() * len(index)
+        print(f"Epoch {epoch + 1}/{epochs}: distillation loss {total_loss / len(texts):.4f}")
+
+    model.eval()
+    return model
+
+
+def save_student(
+    model: MultiTaskModel,
+    student_name: str,
+    output_dir,
+    le_cat: LabelEncoder,
+    le_urg: LabelEncoder
+) -> Path:
+    """Save the student like model.pt, with its encoder config and tokenizer alongside.
+
+    The config next to the weights is what tells load_checkpoint which encoder to build,
+    so MODEL_PATH alone is enough to serve the student.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    model_path = output_dir / "model.pt"
+    torch.save({'state': model.state_dict(), 'le_cat': le_cat, 'le_urg': le_urg}, model_path)
+    AutoConfig.from_pretrained(student_name).save_pretrained(output_dir)
+    AutoTokenizer.from_pretrained(student_name).save_pretrained(output_dir)
+    return model_path
+
+
+def parameter_count(model: Optional[torch.nn.Module]) -> int:
+    if model is None or not hasattr(model, "parameters"):
+        return 0
+    return sum(p.numel() for p in model.parameters())
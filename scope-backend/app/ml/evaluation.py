@@ -0,0 +1,82 @@
+import io
+import resource
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+import torch
+
+
+def validation_split(df: pd.DataFrame) -> pd.DataFrame:
+    """The 20% the training notebook held out (stratified by category, random_state=42)"""
+    from sklearn.model_selection import train_test_split
+    
+    _, val_df = train_test_split(df, test_size=0.2, stratify=df["category"], random_state=42)
+    return val_df
+
+
+def load_labelled_complaints(
+    csv_path: str = "data/complaints.csv",
+    limit: Optional[int] = None,
+    random_state: int = 42,
+    validation_only: bool = False
+) -> Tuple[List[str], List[str], List[str]]:
+    """Load complaint texts with their reference category and urgency labels.
+
+    With validation_only, only the training notebook's validation split of the CSV is kept,
+    so a model trained on the rest is scored on complaints it never saw.
+    """
+    df = pd.read_csv(csv_path).dropna(subset=["complaint_text", "category", "urgency"])
+    if validation_only:
+        df = validation_split(df)
+    if limit is not None and limit < len(df):
+        df = df.sample(n=limit, random_state=random_state)
+    return (
+        df["complaint_text"].astype(str).tolist(),
+        df["category"].astype(str).tolist(),
+        df["urgency"].astype(str).tolist(),
+    )
+
+
+def score_predictions(
+    predictions: List[Dict[str, Any]],
+    categories: List[str],
+    urgencies: List[str]
+) -> Dict[str, float]:
+    """Category, urgency and joint accuracy of predictions against reference labels"""
+    total = len(predictions)
+    if total == 0:
+        return {"category_accuracy": 0.0, "urgency_accuracy": 0.0, "joint_accuracy": 0.0}
+    
+    category_hits = [p["category"] == c for p, c in zip(predictions, categories)]
+    urgency_hits = [p["urgency"] == u for p, u in zip(predictions, urgencies)]
+    return {
+        "category_accuracy": sum(category_hits) / total,
+        "urgency_accuracy": sum(urgency_hits) / total,
+        "joint_accuracy": sum(c and u for c, u in zip(category_hits, urgency_hits)) / total,
+    }
+
+
+def agreement(first: List[Dict[str, Any]], second: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Fraction of texts on which two sets of predictions pick the same labels"""
+    total = len(first)
+    if total == 0:
+        return {"category_agreement": 1.0, "urgency_agreement": 1.0}
+    return {
+        "category_agreement": sum(a["category"] == b["category"] for a, b in zip(first, second)) / total,
+        "urgency_agreement": sum(a["urgency"] == b["urgency"] for a, b in zip(first, second)) / total,
+    }
+
+
+def state_dict_size_mb(model: torch.nn.Module) -> float:
+    """Serialized size of a model's weights in megabytes"""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / (1024 * 1024)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process in megabytes"""
+    # ru_maxrss is kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
@@ -0,0 +1,98 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.ml import model as model_module
+from app.ml.model import DEFAULT_PREDICTION, get_model_predictor
+
+# Singleton instances
+inference_executor = None
+batch_executor = None
+_admission = threading.BoundedSemaphore(settings.INFERENCE_MAX_PENDING) if settings.INFERENCE_MAX_PENDING > 0 else None
+_batch_admission = threading.BoundedSemaphore(max(1, settings.INFERENCE_BATCH_CONCURRENCY))
+
+
+class InferenceOverloadedError(RuntimeError):
+    """Raised when every admission slot for single or batch predictions is taken"""
+
+
+def get_inference_executor() -> ThreadPoolExecutor:
+    """Get or create the bounded thread pool that runs blocking model calls"""
+    global inference_executor
+    if inference_executor is None:
+        max_workers = settings.INFERENCE_MAX_CONCURRENCY
+        if settings.INFERENCE_BATCHING:
+            # Threads only wait on the batcher here, so let a full batch queue up
+            max_workers = max(max_workers, settings.INFERENCE_BATCH_MAX_SIZE)
+        inference_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+    return inference_executor
+
+
+def get_batch_executor() -> ThreadPoolExecutor:
+    """Get or create the separate pool for bulk classification, so batches never hold the
+    threads single predictions run on"""
+    global batch_executor
+    if batch_executor is None:
+        batch_executor = ThreadPoolExecutor(
+            max_workers=max(1, settings.INFERENCE_BATCH_CONCURRENCY),
+            thread_name_prefix="inference-batch"
+        )
+    return batch_executor
+
+
+def _predict(text: str) -> Dict[str, Any]:
+    return get_model_predictor().predict(text)
+
+
+def _predict_batch(texts: List[str]) -> List[Dict[str, Any]]:
+    return get_model_predictor().predict_batch(texts)
+
+
+async def predict_async(text: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Predict off the event loop, falling back to the default prediction on timeout.
+
+    Raises InferenceOverloadedError instead of queueing when every admission slot is taken.
+    The timeout covers the prediction only; a first call waits for the model to load.
+    """
+    timeout = settings.INFERENCE_TIMEOUT_SECONDS if timeout is None else timeout
+    if _admission is not None and not _admission.acquire(blocking=False):
+        raise InferenceOverloadedError(f"{settings.INFERENCE_MAX_PENDING} predictions already pending")
+    loop = asyncio.get_running_loop()
+    executor = get_inference_executor()
+    try:
+        if model_module.model_predictor is None:
+            await loop.run_in_executor(executor, get_model_predictor)
+        future = loop.run_in_executor(executor, _predict, text)
+    except BaseException:
+        if _admission is not None:
+            _admission.release()
+        raise
+    # A timed-out prediction keeps its thread busy, so its slot is freed when it really finishes
+    if _admission is not None:
+        future.add_done_callback(lambda _: _admission.release())
+    try:
+        return await asyncio.wait_for(asyncio.shield(future), timeout=timeout if timeout > 0 else None)
+    except asyncio.TimeoutError:
+        print(f"Warning: Model prediction timed out after {timeout}s, using default prediction")
+        return dict(DEFAULT_PREDICTION)
+
+
+async def predict_batch_async(texts: List[str]) -> List[Dict[str, Any]]:
+    """Predict many texts off the event loop on the batch pool.
+
+    Raises InferenceOverloadedError instead of queueing when INFERENCE_BATCH_CONCURRENCY
+    batches are already running.
+    """
+    if not _batch_admission.acquire(blocking=False):
+        raise InferenceOverloadedError(f"{settings.INFERENCE_BATCH_CONCURRENCY} batch predictions already running")
+    loop = asyncio.get_running_loop()
+    try:
+        future = loop.run_in_executor(get_batch_executor(), _predict_batch, texts)
+    except BaseException:
+        _batch_admission.release()
+        raise
+    # Freed when the batch finishes, even if the request was cancelled meanwhile
+    future.add_done_callback(lambda _: _batch_admission.release())
+    return await asyncio.shield(future)
@@ -0,0 +1,282 @@
+import gc
+import multiprocessing as mp
+import os
+import queue
+import threading
+from multiprocessing.connection import Client, Listener
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import torch
+
+from app.core.config import settings
+
+Address = Union[str, Tuple[str, int]]
+
+# The shipped INFERENCE_POOL_AUTHKEY; requests are unpickled, so nobody may run with a known key
+PLACEHOLDER_POOL_AUTHKEY = "CHANGE_THIS_POOL_AUTHKEY"
+
+
+def parse_address(address: str) -> Address:
+    """'host:port' becomes a TCP address, anything else is a unix socket path"""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return host or "127.0.0.1", int(port)
+    return address
+
+
+def _worker_main(predictor, conn, num_threads: int, cpus: Optional[List[int]]):
+    # Each worker gets its own slice of cores so workers don't fight over threads
+    torch.set_num_threads(num_threads)
+    if cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+
+    while True:
+        try:
+            texts = conn.recv()
+        except EOFError:
+            return
+        if texts is None:
+            return
+        try:
+            conn.send((predictor._forward(texts), None))
+        except Exception as e:
+            conn.send((None, str(e)))
+
+
+class _Job:
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.done = threading.Event()
+        self.predictions = None
+        self.error = None
+        # Set when the caller stopped waiting, so a job still queued is skipped
+        self.abandoned = False
+
+    def finish(self, predictions, error):
+        self.predictions = predictions
+        self.error = error
+        self.done.set()
+
+
+class InferencePoolServer:
+    """Load the model once and serve it from forked worker processes over a local socket.
+
+    The weights live in the parent before forking, so workers share them copy-on-write
+    instead of each holding their own copy of the encoder. Each worker has its own pipe and a
+    driver thread in the parent, so a worker that crashes or hangs only fails its own job
+    and is replaced, instead of leaving callers waiting forever.
+    """
+
+    def __init__(self, predictor, num_workers: int = 2, threads_per_worker: Optional[int] = None, timeout: Optional[float] = None):
+        self.predictor = predictor
+        self.num_workers = max(1, num_workers)
+        cpu_count = os.cpu_count() or 1
+        self.threads_per_worker = threads_per_worker or max(1, cpu_count // self.num_workers)
+        self.timeout = timeout or settings.INFERENCE_POOL_TIMEOUT_SECONDS
+
+        self._context = mp.get_context("fork")
+        self._jobs: "queue.Queue[Optional[_Job]]" = queue.Queue()
+        self._workers: List[Tuple[Any, Any]] = []
+        self._drivers: List[threading.Thread] = []
+        self._listener = None
+        self.respawns = 0
+        self.failures = 0
+
+    def _spawn(self, index: int):
+        cpu_count = os.cpu_count() or 1
+        first = (index * self.threads_per_worker) % cpu_count
+        cpus = [(first + j) % cpu_count for j in range(self.threads_per_worker)]
+        parent_conn, child_conn = self._context.Pipe()
+        worker = self._context.Process(
+            target=_worker_main,
+            args=(self.predictor, child_conn, self.threads_per_worker, cpus),
+            name=f"inference-worker-{index}",
+            daemon=True
+        )
+        worker.start()
+        child_conn.close()
+        return worker, parent_conn
+
+    def _respawn(self, index: int, reason: str):
+        worker, conn = self._workers[index]
+        conn.close()
+        if worker.is_alive():
+            worker.kill()
+        worker.join(timeout=5)
+        print(f"Inference worker {index} {reason} (exit code {worker.exitcode}), starting a new one")
+        self._workers[index] = self._spawn(index)
+        self.respawns += 1
+
+    def start_workers(self):
+        # Move everything allocated so far (the model included) out of the garbage
+        # collector's reach, so collections in workers don't dirty the shared pages
+        gc.collect()
+        gc.freeze()
+
+        self._workers = [self._spawn(i) for i in range(self.num_workers)]
+        for i in range(self.num_workers):
+            driver = threading.Thread(target=self._drive, args=(i,), name=f"inference-driver-{i}", daemon=True)
+            driver.start()
+            self._drivers.append(driver)
+
+    def _drive(self, index: int):
+        """Feed queued jobs to one worker, replacing it when it dies or overruns the timeout"""
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            if job.abandoned:
+                continue
+
+            worker, conn = self._workers[index]
+            if not worker.is_alive():
+                self._respawn(index, "died while idle")
+                worker, conn = self._workers[index]
+
+            try:
+                conn.send(job.texts)
+                # poll also returns when the worker exits, and recv then raises EOFError
+                if not conn.poll(self.timeout):
+                    raise TimeoutError(f"no result after {self.timeout:.0f}s")
+                predictions, error = conn.recv()
+            except (EOFError, OSError, TimeoutError) as e:
+                self.failures += 1
+                job.finish(None, f"worker {index} failed: {str(e) or type(e).__name__}")
+                self._respawn(index, "failed" if not isinstance(e, TimeoutError) else "timed out")
+                continue
+            job.finish(predictions, error)
+
+    def forward(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Run one batch on whichever worker is free and wait for its predictions"""
+        job = _Job(texts)
+        self._jobs.put(job)
+        # Queueing plus one full run; the driver kills a worker that overruns its own share
+        if not job.done.wait(2 * self.timeout):
+            job.abandoned = True
+            raise TimeoutError(f"Inference pool did not answer within {2 * self.timeout:.0f}s")
+
+        if job.error is not None:
+            raise RuntimeError(f"Inference worker failed: {job.error}")
+        return job.predictions
+
+    def info(self) -> Dict[str, Any]:
+        stats = self.predictor.get_stats()
+        return {
+            "fingerprint": stats["fingerprint"],
+            "backend": stats["backend"],
+            "workers": len(self._workers),
+            "threads_per_worker": self.threads_per_worker,
+            "alive": sum(worker.is_alive() for worker, _ in self._workers),
+            "queued": self._jobs.qsize(),
+            "respawns": self.respawns,
+            "failures": self.failures,
+        }
+
+    def _handle_connection(self, conn):
+        # One request at a time per connection; clients open a connection per thread
+        try:
+            while True:
+                try:
+                    request = conn.recv()
+                except EOFError:
+                    return
+                try:
+                    if request["op"] == "forward":
+                        response = {"predictions": self.forward(request["texts"])}
+                    elif request["op"] == "info":
+                        response = self.info()
+                    else:
+                        response = {"error": f"Unknown operation '{request['op']}'"}
+                except Exception as e:
+                    response = {"error": str(e)}
+                conn.send(response)
+        finally:
+            conn.close()
+
+    def serve_forever(self, address: str, authkey: bytes):
+        parsed = parse_address(address)
+        if isinstance(parsed, str) and os.path.exists(parsed):
+            # Left behind by a pool that did not shut down cleanly
+            os.unlink(parsed)
+        self._listener = Listener(parsed, authkey=authkey)
+        if isinstance(parsed, str):
+            # Only the user running the pool and the API may connect
+            os.chmod(parsed, 0o600)
+        print(f"Inference pool serving {len(self._workers)} workers "
+              f"x {self.threads_per_worker} threads on {address}")
+        while True:
+            conn = self._listener.accept()
+            threading.Thread(target=self._handle_connection, args=(conn,), daemon=True).start()
+
+    def shutdown(self):
+        for _ in self._drivers:
+            self._jobs.put(None)
+        for driver in self._drivers:
+            driver.join(timeout=10)
+        for worker, conn in self._workers:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+            worker.join(timeout=10)
+        if self._listener is not None:
+            self._listener.close()
+
+
+class InferencePoolClient:
+    """Send texts from an API worker to the shared inference pool"""
+
+    def __init__(self, address: str, authkey: bytes, timeout: Optional[float] = None):
+        self.address = parse_address(address)
+        self.authkey = authkey
+        # A little longer than the pool's own deadline, so its error normally arrives first
+        self.timeout = timeout or 2 * settings.INFERENCE_POOL_TIMEOUT_SECONDS + 5
+        self._local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = Client(self.address, authkey=self.authkey)
+            self._local.conn = conn
+        return conn
+
+    def _request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        # Retry once on a fresh connection in case the pool restarted
+        for attempt in range(2):
+            conn = self._connection()
+            try:
+                conn.send(request)
+                if not conn.poll(self.timeout):
+                    # A late reply would be read as the answer to the next request, so drop the connection
+                    conn.close()
+                    self._local.conn = None
+                    raise TimeoutError(f"Inference pool did not answer within {self.timeout:.0f}s")
+                response = conn.recv()
+                break
+            except TimeoutError:
+                raise
+            except (EOFError, OSError):
+                conn.close()
+                self._local.conn = None
+                if attempt == 1:
+                    raise
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return response
+
+    def forward(self, texts: List[str]) -> List[Dict[str, Any]]:
+        return self._request({"op": "forward", "texts": texts})["predictions"]
+
+    def info(self) -> Dict[str, Any]:
+        return self._request({"op": "info"})
+
+
+def get_pool_authkey() -> bytes:
+    """The pool's shared secret; raises if it is unset or still the shipped placeholder"""
+    key = settings.INFERENCE_POOL_AUTHKEY.get_secret_value()
+    if not key or key == PLACEHOLDER_POOL_AUTHKEY:
+        raise RuntimeError(
+            "INFERENCE_POOL_AUTHKEY is unset or still the shipped placeholder. Set it to a random secret "
+            "for both the pool and the API workers, e.g. python -c 'import secrets; print(secrets.token_hex(32))'"
+        )
+    return key.encode("utf-8")
@@ -0,0 +1,50 @@
+import json
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+from sklearn.preprocessing import LabelEncoder
+
+from app.core.config import settings
+
+LABELS_FILENAME = "labels.json"
+
+
+def save_label_encoders(path, le_cat: LabelEncoder, le_urg: LabelEncoder) -> Path:
+    """Write the category and urgency label encoders to a small JSON sidecar file"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({
+            "le_cat": [str(c) for c in le_cat.classes_],
+            "le_urg": [str(c) for c in le_urg.classes_],
+        }, f, indent=2)
+    return path
+
+
+def labels_path_for(model_path) -> Path:
+    """labels.json beside a checkpoint, so every checkpoint decodes with its own label set;
+    LABELS_PATH only when the checkpoint has none"""
+    sidecar = Path(model_path).parent / LABELS_FILENAME
+    if sidecar.exists():
+        return sidecar
+    return Path(settings.LABELS_PATH)
+
+
+def load_label_encoders(path) -> Tuple[LabelEncoder, LabelEncoder]:
+    """Rebuild the category and urgency label encoders from a JSON sidecar file"""
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"Label encoder file not found at {path}")
+    
+    with open(path) as f:
+        classes = json.load(f)
+    
+    encoders = []
+    for key in ("le_cat", "le_urg"):
+        if key not in classes:
+            raise ValueError(f"Label encoder '{key}' not found in {path}")
+        encoder = LabelEncoder()
+        encoder.classes_ = np.array(classes[key], dtype=object)
+        encoders.append(encoder)
+    return encoders[0], encoders[1]
@@ -0,0 +1,137 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List
+
+from app.core.config import settings
+
+
+def exponential_bounds(start: float, factor: float, count: int) -> List[float]:
+    return [start * factor ** i for i in range(count)]
+
+
+# 0.05 ms .. ~100 s for timings, 1 .. ~130k for sizes and token counts
+TIMING_BOUNDS_MS = exponential_bounds(0.05, 2.0, 22)
+SIZE_BOUNDS = exponential_bounds(1, 2.0, 18)
+
+
+class Histogram:
+    """Fixed-bucket histogram; recording is a bisect and a few additions under a lock"""
+
+    def __init__(self, bounds: List[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+            if value > self.max:
+                self.max = value
+
+    def _percentile(self, p: float) -> float:
+        # Upper bound of the bucket holding the p-th observation
+        target = p * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target and count:
+                return self.bounds[index] if index < len(self.bounds) else self.max
+        return 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "count": self.count,
+                "sum": self.total,
+                "mean": self.total / self.count if self.count else 0.0,
+                "max": self.max,
+                "p50": self._percentile(0.50),
+                "p95": self._percentile(0.95),
+                "p99": self._percentile(0.99),
+                "buckets": {
+                    (f"le_{self.bounds[i]:g}" if i < len(self.bounds) else "inf"): count
+                    for i, count in enumerate(self.counts) if count
+                },
+            }
+
+
+class InferenceMetrics:
+    """Per-stage timing and size histograms for the prediction path"""
+
+    def __init__(self):
+        self.timings: Dict[str, Histogram] = {}
+        self.sizes: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def _histogram(self, registry: Dict[str, Histogram], name: str, bounds: List[float]) -> Histogram:
+        histogram = registry.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = registry.setdefault(name, Histogram(bounds))
+        return histogram
+
+    def observe_ms(self, stage: str, value_ms: float):
+        self._histogram(self.timings, stage, TIMING_BOUNDS_MS).observe(value_ms)
+
+    def observe_size(self, name: str, value: float):
+        self._histogram(self.sizes, name, SIZE_BOUNDS).observe(value)
+
+    @contextmanager
+    def time(self, stage: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_ms(stage, (time.perf_counter() - started) * 1000.0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "since": self.started_at,
+            "timings_ms": {name: h.snapshot() for name, h in sorted(self.timings.items())},
+            "sizes": {name: h.snapshot() for name, h in sorted(self.sizes.items())},
+        }
+
+    def reset(self):
+        with self._lock:
+            self.timings = {}
+            self.sizes = {}
+            self.started_at = time.time()
+
+
+class NullMetrics:
+    """Stand-in used when instrumentation is switched off"""
+
+    def observe_ms(self, stage: str, value_ms: float):
+        pass
+
+    def observe_size(self, name: str, value: float):
+        pass
+
+    @contextmanager
+    def time(self, stage: str):
+        yield
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"enabled": False}
+
+    def reset(self):
+        pass
+
+
+# Singleton instances
+inference_metrics = InferenceMetrics()
+null_metrics = NullMetrics()
+
+
+def get_inference_metrics():
+    """Get the process-wide metrics registry, or a no-op one when metrics are disabled"""
+    return inference_metrics if settings.INFERENCE_METRICS_ENABLED else null_metrics
@@ -0,0 +1,155 @@
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import torch
+from transformers import AutoTokenizer
+
+from app.core.config import settings
+from app.ml.labels import LABELS_FILENAME, save_label_encoders
+from app.ml.model import load_checkpoint, model_source
+
+INPUT_NAMES = ["input_ids", "attention_mask"]
+OUTPUT_NAMES = ["category_logits", "urgency_logits", "embedding"]
+
+
+class _ExportWrapper(torch.nn.Module):
+    """Expose the [CLS] vector as a graph output alongside both heads"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask):
+        return self.model(input_ids, attention_mask, return_embedding=True)
+
+
+class OnnxModelRunner:
+    """Run an exported MultiTaskModel graph with ONNX Runtime on CPU"""
+
+    def __init__(self, onnx_path, intra_op_threads: int = 0):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError("onnxruntime is required for INFERENCE_BACKEND=onnx. Install it with 'pip install onnxruntime'.") from e
+
+        onnx_path = Path(onnx_path)
+        if not onnx_path.exists():
+            raise FileNotFoundError(f"ONNX model file not found at {onnx_path}. Export it with scripts/export_onnx.py")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads > 0:
+            options.intra_op_num_threads = intra_op_threads
+
+        self.session = ort.InferenceSession(
+            str(onnx_path),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.output_names = [output.name for output in self.session.get_outputs()]
+
+    def __call__(self, input_ids, attention_mask, token_type_ids=None, return_embedding=False):
+        # Accept the same tensors the torch model receives and hand back torch outputs
+        feeds = {
+            "input_ids": input_ids.cpu().numpy().astype(np.int64),
+            "attention_mask": attention_mask.cpu().numpy().astype(np.int64),
+        }
+        if return_embedding and "embedding" not in self.output_names:
+            raise ValueError("This ONNX graph has no embedding output. Re-export it with scripts/export_onnx.py")
+        
+        output_names = OUTPUT_NAMES if return_embedding else OUTPUT_NAMES[:2]
+        return tuple(torch.from_numpy(output) for output in self.session.run(output_names, feeds))
+
+
+def export_onnx(
+    model_path=None,
+    onnx_path=None,
+    labels_path=None,
+    opset_version: int = 17
+) -> Dict[str, str]:
+    """Export the checkpoint's encoder and both heads to ONNX, with label encoders alongside"""
+    model_path = Path(model_path or settings.MODEL_PATH)
+    onnx_path = Path(onnx_path or settings.ONNX_MODEL_PATH)
+    # Beside the ONNX file, where loading looks for them first
+    labels_path = Path(labels_path or onnx_path.parent / LABELS_FILENAME)
+
+    model, le_cat, le_urg = load_checkpoint(model_path)
+    tokenizer = AutoTokenizer.from_pretrained(model_source(model_path))
+
+    # Trace with a small padded batch; batch and sequence axes stay dynamic
+    sample = tokenizer(
+        ["The wifi in my dorm keeps dropping.", "No hot water since yesterday in the east wing."],
+        return_tensors="pt",
+        padding=True
+    )
+
+    onnx_path.parent.mkdir(parents=True, exist_ok=True)
+    with torch.no_grad():
+        torch.onnx.export(
+            _ExportWrapper(model),
+            (sample["input_ids"], sample["attention_mask"]),
+            str(onnx_path),
+            input_names=INPUT_NAMES,
+            output_names=OUTPUT_NAMES,
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "category_logits": {0: "batch"},
+                "urgency_logits": {0: "batch"},
+                "embedding": {0: "batch"},
+            },
+            opset_version=opset_version,
+        )
+
+    save_label_encoders(labels_path, le_cat, le_urg)
+    return {"onnx_path": str(onnx_path), "labels_path": str(labels_path)}
+
+
+def check_parity(
+    texts: List[str],
+    model_path=None,
+    onnx_path=None,
+    batch_size: int = 16,
+    atol: float = 1e-3
+) -> Dict[str, Any]:
+    """Compare ONNX Runtime logits and labels against the torch checkpoint on the same texts"""
+    model_path = Path(model_path or settings.MODEL_PATH)
+    model, _, _ = load_checkpoint(model_path)
+    runner = OnnxModelRunner(onnx_path or settings.ONNX_MODEL_PATH)
+    tokenizer = AutoTokenizer.from_pretrained(model_source(model_path))
+
+    max_abs_diff = 0.0
+    category_matches = 0
+    urgency_matches = 0
+
+    for start in range(0, len(texts), batch_size):
+        inputs = tokenizer(
+            texts[start:start + batch_size],
+            return_tensors="pt",
+            truncation=True,
+            padding=True,
+            max_length=512
+        )
+        with torch.no_grad():
+            torch_cat, torch_urg = model(inputs["input_ids"], inputs["attention_mask"])
+        onnx_cat, onnx_urg = runner(inputs["input_ids"], inputs["attention_mask"])
+
+        max_abs_diff = max(
+            max_abs_diff,
+            (torch_cat - onnx_cat).abs().max().item(),
+            (torch_urg - onnx_urg).abs().max().item()
+        )
+        category_matches += (torch_cat.argmax(1) == onnx_cat.argmax(1)).sum().item()
+        urgency_matches += (torch_urg.argmax(1) == onnx_urg.argmax(1)).sum().item()
+
+    total = len(texts)
+    category_agreement = category_matches / total if total else 1.0
+    urgency_agreement = urgency_matches / total if total else 1.0
+    return {
+        "texts": total,
+        "max_abs_logit_diff": max_abs_diff,
+        "category_agreement": category_agreement,
+        "urgency_agreement": urgency_agreement,
+        "passed": max_abs_diff <= atol and category_agreement == 1.0 and urgency_agreement == 1.0,
+    }
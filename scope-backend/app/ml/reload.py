@@ -0,0 +1,259 @@
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.ml.cache import checkpoint_fingerprint
+from app.ml.evaluation import load_labelled_complaints, score_predictions
+from app.ml.model import ModelPredictor, get_model_predictor, swap_model_predictor
+
+
+class ReloadInProgress(Exception):
+    """Raised when a reload is requested while another one is still running"""
+
+
+def predict_holdout(predictor, texts: List[str]) -> List[Dict[str, Any]]:
+    """Run texts straight through the encoder, bypassing the cache and the cascade"""
+    chunk_size = settings.INFERENCE_BATCH_CHUNK_SIZE
+    predictions = []
+    for start in range(0, len(texts), chunk_size):
+        predictions.extend(predictor._forward(texts[start:start + chunk_size]))
+    return predictions
+
+
+class ModelReloader:
+    """Load a new checkpoint next to the live model, validate it, then swap it in.
+
+    The live predictor keeps serving while the candidate loads and warms up. After the
+    swap, the old predictor is only closed once requests that already hold it have had
+    MODEL_RELOAD_DRAIN_SECONDS to finish.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.state = "idle"
+        self.current: Optional[Dict[str, Any]] = None
+        self.history = deque(maxlen=10)
+        # Holdout scores of the live model, so each reload only has to score the candidate
+        self._baseline: Optional[Dict[str, Any]] = None
+        self._holdout = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start_reload(self, model_path: Optional[str] = None, force: bool = False) -> Dict[str, Any]:
+        """Reload in a background thread; raises ReloadInProgress if one is already running"""
+        model_path = resolve_model_path(model_path, settings.INFERENCE_BACKEND)
+        if not self._lock.acquire(blocking=False):
+            raise ReloadInProgress("A model reload is already in progress")
+        self.state = "loading"
+        threading.Thread(
+            target=self._reload_locked,
+            args=(model_path, force),
+            name="model-reload",
+            daemon=True
+        ).start()
+        return self.stats()
+
+    def reload(self, model_path: Optional[str] = None, force: bool = False) -> Dict[str, Any]:
+        """Reload in the calling thread and return the outcome"""
+        if not self._lock.acquire(blocking=False):
+            raise ReloadInProgress("A model reload is already in progress")
+        self.state = "loading"
+        return self._reload_locked(model_path, force)
+
+    def _reload_locked(self, model_path: Optional[str], force: bool) -> Dict[str, Any]:
+        try:
+            result = self._reload(model_path, force)
+        except Exception as e:
+            result = {"outcome": "failed", "model_path": model_path, "error": str(e)}
+            print(f"Model reload failed: {str(e)}")
+        finally:
+            self.state = "idle"
+            self._lock.release()
+
+        result["finished_at"] = time.time()
+        self.current = result
+        self.history.appendleft(result)
+        return result
+
+    def _reload(self, model_path: Optional[str], force: bool) -> Dict[str, Any]:
+        backend = settings.INFERENCE_BACKEND
+        model_path = resolve_model_path(model_path, backend)
+        live = get_model_predictor()
+        started = time.perf_counter()
+
+        # Touching or re-copying the same file is not a new version
+        candidate_version = f"{backend}-{checkpoint_fingerprint(model_path)}"
+        if not force and isinstance(live, ModelPredictor) and live.fingerprint.startswith(candidate_version):
+            return {"outcome": "unchanged", "model_path": model_path, "model_version": live.fingerprint}
+
+        self.state = "loading"
+        candidate = ModelPredictor(backend=backend, model_path=model_path)
+
+        self.state = "warming"
+        candidate.warmup(batches=settings.MODEL_WARMUP_BATCHES)
+
+        self.state = "validating"
+        validation = self.validate(candidate, live)
+        if not validation["passed"]:
+            candidate.close()
+            return {
+                "outcome": "rejected",
+                "model_path": model_path,
+                "model_version": candidate.fingerprint,
+                "validation": validation,
+                "seconds": time.perf_counter() - started,
+            }
+
+        self.state = "swapping"
+        previous = swap_model_predictor(candidate)
+        self._baseline = {"model_version": candidate.fingerprint, "scores": validation["candidate"]}
+
+        # Later lazy loads and the file watcher follow the new checkpoint
+        if backend == "onnx":
+            settings.ONNX_MODEL_PATH = model_path
+        else:
+            settings.MODEL_PATH = model_path
+
+        if previous is not None:
+            retire = threading.Timer(settings.MODEL_RELOAD_DRAIN_SECONDS, previous.close)
+            retire.daemon = True
+            retire.start()
+
+        print(f"Swapped in model {candidate.fingerprint} from {model_path}")
+        return {
+            "outcome": "swapped",
+            "model_path": model_path,
+            "model_version": candidate.fingerprint,
+            "previous_version": previous.get_stats()["fingerprint"] if previous is not None else None,
+            "validation": validation,
+            "seconds": time.perf_counter() - started,
+        }
+
+    def _holdout_sample(self):
+        if self._holdout is None:
+            self._holdout = load_labelled_complaints(
+                settings.MODEL_RELOAD_HOLDOUT_CSV,
+                settings.MODEL_RELOAD_HOLDOUT_SAMPLES,
+                validation_only=settings.MODEL_RELOAD_HOLDOUT_SPLIT
+            )
+        return self._holdout
+
+    def validate(self, candidate, live) -> Dict[str, Any]:
+        """Score the candidate on the holdout sample against fixed and relative accuracy floors"""
+        if settings.MODEL_RELOAD_HOLDOUT_SAMPLES <= 0:
+            return {"passed": True, "skipped": True}
+
+        texts, categories, urgencies = self._holdout_sample()
+        scores = score_predictions(predict_holdout(candidate, texts), categories, urgencies)
+
+        # The live model is scored once per version; a fallback predictor has no baseline
+        baseline = None
+        if isinstance(live, ModelPredictor):
+            if self._baseline is None or self._baseline["model_version"] != live.fingerprint:
+                live_scores = score_predictions(predict_holdout(live, texts), categories, urgencies)
+                self._baseline = {"model_version": live.fingerprint, "scores": live_scores}
+            baseline = self._baseline["scores"]
+
+        reasons = []
+        for metric in ("category_accuracy", "urgency_accuracy"):
+            if scores[metric] < settings.MODEL_RELOAD_MIN_ACCURACY:
+                reasons.append(f"{metric} {scores[metric]:.3f} is below {settings.MODEL_RELOAD_MIN_ACCURACY:.3f}")
+            if baseline is not None and baseline[metric] - scores[metric] > settings.MODEL_RELOAD_MAX_ACCURACY_DROP:
+                reasons.append(f"{metric} dropped from {baseline[metric]:.3f} to {scores[metric]:.3f}")
+
+        return {
+            "passed": not reasons,
+            "samples": len(texts),
+            "candidate": scores,
+            "live": baseline,
+            "reasons": reasons,
+        }
+
+    def start_watching(self, interval: Optional[float] = None):
+        """Poll the live checkpoint file and reload it when it changes"""
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch,
+            args=(interval or settings.MODEL_RELOAD_WATCH_INTERVAL_SECONDS,),
+            name="model-reload-watcher",
+            daemon=True
+        )
+        self._watcher.start()
+
+    def stop_watching(self):
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+    def _watch(self, interval: float):
+        seen = _file_signature(watched_model_path())
+        pending = None
+        while not self._stop.wait(interval):
+            signature = _file_signature(watched_model_path())
+            if signature == seen:
+                pending = None
+                continue
+            # Wait for the file to stop changing, so a half-copied checkpoint is never loaded
+            if signature is None or signature != pending:
+                pending = signature
+                continue
+            try:
+                self.reload()
+                seen = signature
+            except ReloadInProgress:
+                continue
+            pending = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "watching": self._watcher is not None,
+            "last": self.current,
+            "history": list(self.history),
+        }
+
+
+def watched_model_path() -> str:
+    return settings.ONNX_MODEL_PATH if settings.INFERENCE_BACKEND == "onnx" else settings.MODEL_PATH
+
+
+def resolve_model_path(model_path: Optional[str], backend: str) -> str:
+    """Default to the configured file, and only accept files in its directory or below it"""
+    if backend == "pool":
+        raise ValueError("The pool backend loads its model in scripts/inference_server.py; restart the pool instead")
+
+    default = settings.ONNX_MODEL_PATH if backend == "onnx" else settings.MODEL_PATH
+    if not model_path:
+        return default
+
+    # Checkpoints are unpickled, so an API caller must not be able to point anywhere on disk
+    model_dir = Path(default).resolve().parent
+    resolved = Path(model_path).resolve()
+    if model_dir not in resolved.parents:
+        raise ValueError(f"Model files must live in {model_dir}")
+    if not resolved.exists():
+        raise FileNotFoundError(f"Model file not found at {model_path}")
+    return model_path
+
+
+def _file_signature(path: str):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+# Singleton instance
+model_reloader = ModelReloader()
+
+
+def get_model_reloader() -> ModelReloader:
+    return model_reloader
@@ -0,0 +1,248 @@
+import multiprocessing as mp
+import os
+import queue
+import random
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.ml.metrics import TIMING_BOUNDS_MS, Histogram, get_inference_metrics
+
+# Confidence histograms in steps of 0.05
+CONFIDENCE_BOUNDS = [round(0.05 * i, 2) for i in range(1, 21)]
+COMPARED_FIELDS = ("category", "urgency", "confidence_category", "confidence_urgency", "stage", "model_version")
+
+
+def _shadow_main(tasks, results, backend: str, model_path: str, num_threads: int):
+    # Stay out of the way of the live model: lowest CPU priority and few threads
+    try:
+        os.nice(19)
+    except (AttributeError, OSError):
+        pass
+
+    import torch
+    from app.ml.model import ModelPredictor
+
+    torch.set_num_threads(num_threads)
+    settings.PREDICTION_CACHE_ENABLED = False
+    settings.CASCADE_ENABLED = False
+    settings.INFERENCE_BATCHING = False
+
+    try:
+        predictor = ModelPredictor(backend=backend, model_path=model_path)
+    except Exception as e:
+        results.put(("failed", str(e)))
+        return
+    results.put(("ready", predictor.fingerprint))
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        text, primary = task
+        started = time.perf_counter()
+        try:
+            shadow = predictor._forward([text])[0]
+            shadow.pop("embedding", None)
+            results.put(("result", (primary, shadow, (time.perf_counter() - started) * 1000.0)))
+        except Exception as e:
+            results.put(("error", str(e)))
+
+
+class ShadowEvaluator:
+    """Replay a sample of live complaints against a candidate model in a separate process.
+
+    The request path only pays for a random draw and a non-blocking enqueue; when the queue
+    is full the complaint is simply not shadowed.
+    """
+
+    def __init__(self, backend: str, model_path: str, sample_rate: float, queue_size: int = 1000, num_threads: int = 1):
+        self.backend = backend
+        self.model_path = model_path
+        self.sample_rate = sample_rate
+        self.num_threads = num_threads
+
+        self._context = mp.get_context("spawn")
+        self._tasks = self._context.Queue(maxsize=queue_size)
+        self._results = self._context.Queue()
+        self._process = None
+        self._collector = None
+        self._lock = threading.Lock()
+        self.state = "stopped"
+        self.error = None
+        self.shadow_version = None
+        self._reset_stats()
+
+    def _reset_stats(self):
+        with self._lock:
+            self.started_at = time.time()
+            self.submitted = 0
+            self.dropped = 0
+            self.compared = 0
+            self.errors = 0
+            self.category_agreed = 0
+            self.urgency_agreed = 0
+            self.both_agreed = 0
+            self.latency_ms = Histogram(TIMING_BOUNDS_MS)
+            self.confidence = {
+                side: {head: Histogram(CONFIDENCE_BOUNDS) for head in ("category", "urgency")}
+                for side in ("primary", "shadow")
+            }
+            self.disagreements = Counter()
+            self.primary_versions = Counter()
+
+    def start(self):
+        if self._process is not None:
+            return
+        self.state = "loading"
+        self._process = self._context.Process(
+            target=_shadow_main,
+            args=(self._tasks, self._results, self.backend, self.model_path, self.num_threads),
+            name="shadow-evaluator",
+            daemon=True
+        )
+        self._process.start()
+        self._collector = threading.Thread(target=self._collect, name="shadow-results", daemon=True)
+        self._collector.start()
+
+    def stop(self):
+        if self._process is None:
+            return
+        try:
+            self._tasks.put_nowait(None)
+        except queue.Full:
+            self._process.terminate()
+        self._process.join(timeout=10)
+        self._process = None
+        self.state = "stopped"
+
+    def submit(self, text: str, primary: Dict[str, Any]):
+        """Maybe shadow this complaint; never blocks"""
+        if self.state != "ready" or random.random() >= self.sample_rate:
+            return
+        # The fallback prediction says nothing about the live model
+        if primary.get("stage") == "default":
+            return
+        try:
+            self._tasks.put_nowait((text, {field: primary.get(field) for field in COMPARED_FIELDS}))
+            submitted = True
+        except queue.Full:
+            submitted = False
+        with self._lock:
+            if submitted:
+                self.submitted += 1
+            else:
+                self.dropped += 1
+
+    def _collect(self):
+        while True:
+            try:
+                kind, payload = self._results.get()
+            except (EOFError, OSError):
+                return
+            if kind == "ready":
+                self.shadow_version = payload
+                self.state = "ready"
+                print(f"Shadow model {payload} ready")
+            elif kind == "failed":
+                self.state = "failed"
+                self.error = payload
+                print(f"Shadow model failed to load: {payload}")
+                return
+            elif kind == "error":
+                with self._lock:
+                    self.errors += 1
+                    self.error = payload
+            else:
+                self._record(*payload)
+
+    def _record(self, primary: Dict[str, Any], shadow: Dict[str, Any], latency_ms: float):
+        category_agrees = primary["category"] == shadow["category"]
+        urgency_agrees = primary["urgency"] == shadow["urgency"]
+        with self._lock:
+            self.compared += 1
+            self.category_agreed += category_agrees
+            self.urgency_agreed += urgency_agrees
+            self.both_agreed += category_agrees and urgency_agrees
+            self.primary_versions[primary.get("model_version")] += 1
+            if not category_agrees:
+                self.disagreements[f"category: {primary['category']} -> {shadow['category']}"] += 1
+            if not urgency_agrees:
+                self.disagreements[f"urgency: {primary['urgency']} -> {shadow['urgency']}"] += 1
+            self.latency_ms.observe(latency_ms)
+            for side, prediction in (("primary", primary), ("shadow", shadow)):
+                self.confidence[side]["category"].observe(prediction["confidence_category"])
+                self.confidence[side]["urgency"].observe(prediction["confidence_urgency"])
+
+    def reset(self):
+        self._reset_stats()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            compared = self.compared
+            return {
+                "state": self.state,
+                "error": self.error,
+                "backend": self.backend,
+                "model_path": self.model_path,
+                "shadow_version": self.shadow_version,
+                "primary_versions": dict(self.primary_versions),
+                "sample_rate": self.sample_rate,
+                "since": self.started_at,
+                "submitted": self.submitted,
+                "dropped": self.dropped,
+                "queued": max(0, self.submitted - self.compared - self.errors),
+                "compared": compared,
+                "errors": self.errors,
+                "agreement": {
+                    "category": self.category_agreed / compared if compared else None,
+                    "urgency": self.urgency_agreed / compared if compared else None,
+                    "both": self.both_agreed / compared if compared else None,
+                },
+                "latency_ms": self.latency_ms.snapshot(),
+                # The live model's encoder time in this worker, for reference
+                "primary_forward_latency_ms": get_inference_metrics().snapshot().get("timings_ms", {}).get("forward"),
+                "confidence": {
+                    side: {head: histogram.snapshot() for head, histogram in heads.items()}
+                    for side, heads in self.confidence.items()
+                },
+                "top_disagreements": dict(self.disagreements.most_common(10)),
+            }
+
+
+# Singleton instance
+shadow_evaluator: Optional[ShadowEvaluator] = None
+
+
+def get_shadow_evaluator() -> Optional[ShadowEvaluator]:
+    return shadow_evaluator
+
+
+def start_shadow_evaluator() -> Optional[ShadowEvaluator]:
+    global shadow_evaluator
+    if settings.SHADOW_ENABLED and shadow_evaluator is None:
+        shadow_evaluator = ShadowEvaluator(
+            backend=settings.SHADOW_BACKEND,
+            model_path=settings.SHADOW_MODEL_PATH,
+            sample_rate=settings.SHADOW_SAMPLE_RATE,
+            queue_size=settings.SHADOW_QUEUE_SIZE,
+            num_threads=settings.SHADOW_THREADS
+        )
+        shadow_evaluator.start()
+    return shadow_evaluator
+
+
+def stop_shadow_evaluator():
+    global shadow_evaluator
+    if shadow_evaluator is not None:
+        shadow_evaluator.stop()
+        shadow_evaluator = None
+
+
+def shadow_prediction(text: str, primary: Dict[str, Any]):
+    """Hand a live prediction to the shadow evaluator if one is running"""
+    evaluator = shadow_evaluator
+    if evaluator is not None:
+        evaluator.submit(text, primary)
@@ -0,0 +1,17 @@
+from typing import Optional
+
+import numpy as np
+
+
+def vector_to_bytes(vector) -> Optional[bytes]:
+    """Pack a vector as compact float16 bytes for storage"""
+    if vector is None:
+        return None
+    return np.asarray(vector, dtype=np.float16).tobytes()
+
+
+def vector_from_bytes(data: Optional[bytes]) -> Optional[np.ndarray]:
+    """Unpack float16 bytes into a float32 vector ready for numeric work"""
+    if data is None:
+        return None
+    return np.frombuffer(data, dtype=np.float16).astype(np.float32)
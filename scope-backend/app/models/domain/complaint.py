@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, Boolean, LargeBinary
 from sqlalchemy.sql import func
 import enum
 
@@ -30,7 +30,13 @@ class Complaint(Base):
     category = Column(Enum(Category), nullable=True)
     urgency = Column(Enum(Urgency), nullable=True)
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), index=True)
     status = Column(String, default="Pending")
     assigned_to = Column(String, nullable=True)
     response = Column(Text, nullable=True)
+    classification_pending = Column(Boolean, default=False, nullable=False, index=True)
+    # Category or urgency was set by staff; reclassification leaves these labels alone
+    labels_edited = Column(Boolean, default=False, nullable=False)
+    # Classifier [CLS] vector as float16 bytes, tagged with the model that produced it
+    embedding = Column(LargeBinary, nullable=True)
+    embedding_version = Column(String, nullable=True)
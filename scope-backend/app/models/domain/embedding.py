@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, DateTime, LargeBinary
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+
+
+class TextEmbedding(Base):
+    """Embedding of a text by one model, addressed by the text's content hash"""
+    __tablename__ = "text_embeddings"
+
+    # sha256 hex digest of the embedded text
+    text_hash = Column(String(64), primary_key=True)
+    model_name = Column(String, primary_key=True)
+    # float16 bytes, see app.ml.vectors
+    vector = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=func.now())
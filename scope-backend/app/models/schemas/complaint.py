@@ -30,6 +30,7 @@ class ComplaintInDB(ComplaintBase):
     status: str
     assigned_to: Optional[str] = None
     response: Optional[str] = None
+    classification_pending: bool = False
 
     class Config:
         from_attributes = True
@@ -44,6 +45,18 @@ class ComplaintPrediction(BaseModel):
     urgency: Urgency
     confidence_category: float
     confidence_urgency: float
+    # Which stage answered: "cascade", "model" or "default" when the model was unavailable
+    stage: Optional[str] = None
+    # Fingerprint of the model that produced this prediction, None for the default fallback
+    model_version: Optional[str] = None
+
+
+class ComplaintBatchClassify(BaseModel):
+    texts: List[str] = Field(..., min_length=1)
+
+
+class ComplaintBatchPrediction(BaseModel):
+    predictions: List[ComplaintPrediction]
 
 class PaginatedComplaintsResponse(BaseModel):
     items: List[ComplaintResponse]
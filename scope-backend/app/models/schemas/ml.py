@@ -0,0 +1,9 @@
+from typing import Optional
+from pydantic import BaseModel
+
+
+class ModelReloadRequest(BaseModel):
+    # A checkpoint next to the configured one; defaults to MODEL_PATH (ONNX_MODEL_PATH for onnx)
+    model_path: Optional[str] = None
+    # Reload even when the file's fingerprint matches the live model
+    force: bool = False
@@ -0,0 +1,39 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+from datetime import datetime
+from app.models.domain.complaint import Category, Urgency
+
+
+class ComplaintSearchFilters(BaseModel):
+    category: Optional[Category] = None
+    urgency: Optional[Urgency] = None
+    # Matched case-insensitively, e.g. "pending" or "In Progress"
+    status: Optional[str] = None
+    # Inclusive bounds on created_at
+    created_from: Optional[datetime] = None
+    created_to: Optional[datetime] = None
+
+
+class ComplaintSearchRequest(ComplaintSearchFilters):
+    query: str = Field(..., min_length=1)
+    k: int = Field(5, ge=1, le=100)
+
+
+class ComplaintSearchHit(BaseModel):
+    id: int
+    score: float
+    complaint_text: str
+    category: Optional[Category] = None
+    urgency: Optional[Urgency] = None
+    status: str
+    created_at: datetime
+    # Hybrid search only: 1-based rank among each retriever's candidates, None if it missed
+    vector_rank: Optional[int] = None
+    keyword_rank: Optional[int] = None
+
+
+class ComplaintSearchResponse(BaseModel):
+    query: str
+    # Complaints that pass the filters; hits has min(k, matching) entries
+    matching: int
+    hits: List[ComplaintSearchHit]
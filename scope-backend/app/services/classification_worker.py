@@ -0,0 +1,159 @@
+import threading
+from typing import List, Optional, Set
+
+from sqlalchemy import update
+
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.ml.model import DummyPredictor, get_model_predictor
+from app.ml.shadow import shadow_prediction
+from app.ml.vectors import vector_to_bytes
+from app.models.domain.complaint import Complaint
+
+
+class ClassificationWorker:
+    """Background thread pool that classifies complaints stored with classification_pending"""
+
+    def __init__(self, num_workers: int = 1, batch_size: int = 32, poll_seconds: float = 5.0):
+        self.num_workers = max(1, num_workers)
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._claim_lock = threading.Lock()
+        self._claimed: Set[int] = set()
+        self._threads: List[threading.Thread] = []
+        self.classified = 0
+        self.failed_batches = 0
+        self.waiting_for_model = False
+
+    def start(self):
+        """Start the worker threads; rows left pending by a previous run are picked up first"""
+        for i in range(self.num_workers):
+            thread = threading.Thread(target=self._loop, name=f"classification-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        self._wakeup.set()
+
+    def stop(self, timeout: Optional[float] = None):
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def notify(self):
+        """Wake the workers up because a new pending complaint was stored"""
+        self._wakeup.set()
+
+    def _loop(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.poll_seconds)
+            self._wakeup.clear()
+            
+            # Keep draining until there is nothing left to claim
+            while not self._stopping.is_set() and self._drain_batch():
+                pass
+
+    def _claim(self, db) -> List[Complaint]:
+        # Threads in this process never pick up the same rows
+        with self._claim_lock:
+            query = db.query(Complaint).filter(Complaint.classification_pending.is_(True))
+            if self._claimed:
+                query = query.filter(Complaint.id.notin_(self._claimed))
+            complaints = query.order_by(Complaint.id).limit(self.batch_size).all()
+            self._claimed.update(c.id for c in complaints)
+            return complaints
+
+    def _drain_batch(self) -> bool:
+        # Pending rows are worth more than default labels: keep them until a real model is loaded
+        predictor = get_model_predictor()
+        if isinstance(predictor, DummyPredictor):
+            if not self.waiting_for_model:
+                print("Warning: Model failed to load, leaving complaints pending until one is loaded")
+            self.waiting_for_model = True
+            return False
+        self.waiting_for_model = False
+        
+        db = SessionLocal()
+        complaints = []
+        try:
+            complaints = self._claim(db)
+            if not complaints:
+                return False
+            
+            predictions = predictor.predict_batch([str(c.complaint_text) for c in complaints])
+            
+            # Only touch rows that are still pending, e.g. staff may have set labels meanwhile
+            shadowed = []
+            for complaint, prediction in zip(complaints, predictions):
+                values = {
+                    "category": prediction["category"],
+                    "urgency": prediction["urgency"],
+                    "classification_pending": False
+                }
+                if prediction.get("embedding") is not None:
+                    values["embedding"] = vector_to_bytes(prediction["embedding"])
+                    values["embedding_version"] = prediction.get("model_version")
+                db.execute(
+                    update(Complaint)
+                    .where(Complaint.id == complaint.id, Complaint.classification_pending.is_(True))
+                    .values(**values)
+                )
+                shadowed.append((str(complaint.complaint_text), prediction))
+            db.commit()
+            self.classified += len(complaints)
+        except Exception as e:
+            print(f"Warning: Background classification failed: {e}")
+            db.rollback()
+            self.failed_batches += 1
+            return False
+        finally:
+            with self._claim_lock:
+                self._claimed.difference_update(c.id for c in complaints)
+            db.close()
+        
+        # After the commit, so a shadow failure can never roll the batch back and stall the queue
+        try:
+            for text, prediction in shadowed:
+                shadow_prediction(text, prediction)
+        except Exception as e:
+            print(f"Warning: Failed to submit shadow predictions: {e}")
+        return True
+
+    def stats(self):
+        return {
+            "workers": len(self._threads),
+            "in_flight": len(self._claimed),
+            "classified": self.classified,
+            "failed_batches": self.failed_batches,
+            "waiting_for_model": self.waiting_for_model,
+        }
+
+
+# Singleton instance
+classification_worker = None
+
+
+def get_classification_worker() -> Optional[ClassificationWorker]:
+    """Get the running classification worker, or None when intake classifies synchronously"""
+    return classification_worker
+
+
+def start_classification_worker() -> ClassificationWorker:
+    global classification_worker
+    if classification_worker is None:
+        classification_worker = ClassificationWorker(
+            num_workers=settings.CLASSIFICATION_WORKERS,
+            batch_size=settings.CLASSIFICATION_BATCH_SIZE,
+            poll_seconds=settings.CLASSIFICATION_POLL_SECONDS
+        )
+        classification_worker.start()
+    return classification_worker
+
+
+def stop_classification_worker():
+    global classification_worker
+    if classification_worker is not None:
+        classification_worker.stop(timeout=30)
+        classification_worker = None
@@ -2,16 +2,23 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.models.domain.complaint import Complaint
 from app.models.schemas.complaint import ComplaintCreate, ComplaintUpdate
-from app.ml.model import get_model_predictor
+from app.ml.executor import InferenceOverloadedError, predict_async
+from app.ml.shadow import shadow_prediction
+from app.chatbot.vector_index import notify_complaint_changed, notify_complaint_deleted
+from app.ml.vectors import vector_to_bytes
+from app.core.config import settings
+from app.services.classification_worker import get_classification_worker
 
 
 class ComplaintService:
     @staticmethod
     async def create_complaint(db: Session, complaint: ComplaintCreate) -> Complaint:
+        if settings.CLASSIFICATION_MODE == "async":
+            return await ComplaintService.create_pending_complaint(db, complaint)
+        
         try:
-            # Get predictions from ML model
-            model_predictor = get_model_predictor()
-            prediction = model_predictor.predict(complaint.complaint_text)
+            # Get predictions from ML model without blocking the event loop
+            prediction = await predict_async(complaint.complaint_text)
             
             # Create new complaint with predicted categories
             db_complaint = Complaint(
@@ -20,9 +27,14 @@ class ComplaintService:
                 urgency=prediction["urgency"],
                 status="Pending"
             )
+            ComplaintService.set_embedding(db_complaint, prediction)
+        except InferenceOverloadedError:
+            # Saturated: reject rather than store a guessed label
+            raise
         except Exception as e:
             print(f"Warning: Failed to use ML model for prediction: {e}")
             # Default to medium priority and "Other" category if model fails
+            prediction = None
             db_complaint = Complaint(
                 complaint_text=complaint.complaint_text,
                 category="Other",
@@ -32,6 +44,41 @@ class ComplaintService:
         db.add(db_complaint)
         db.commit()
         db.refresh(db_complaint)
+        notify_complaint_changed(db_complaint.id)
+        
+        if prediction is not None:
+            # Only enqueues; the shadow model runs in its own process. A shadow failure must
+            # never change the stored labels, so it is logged and ignored
+            try:
+                shadow_prediction(complaint.complaint_text, prediction)
+            except Exception as e:
+                print(f"Warning: Failed to submit shadow prediction: {e}")
+        return db_complaint
+    
+    @staticmethod
+    def set_embedding(db_complaint: Complaint, prediction: dict):
+        """Keep the classifier's [CLS] vector on the complaint when the prediction has one"""
+        if prediction.get("embedding") is None:
+            return
+        db_complaint.embedding = vector_to_bytes(prediction["embedding"])
+        db_complaint.embedding_version = prediction.get("model_version")
+    
+    @staticmethod
+    async def create_pending_complaint(db: Session, complaint: ComplaintCreate) -> Complaint:
+        """Store a complaint right away and leave classification to the background worker"""
+        db_complaint = Complaint(
+            complaint_text=complaint.complaint_text,
+            status="Pending",
+            classification_pending=True
+        )
+        db.add(db_complaint)
+        db.commit()
+        db.refresh(db_complaint)
+        notify_complaint_changed(db_complaint.id)
+        
+        worker = get_classification_worker()
+        if worker is not None:
+            worker.notify()
         return db_complaint
     
     @staticmethod
@@ -96,8 +143,17 @@ class ComplaintService:
             update_data = complaint_update.model_dump(exclude_unset=True)
             for key, value in update_data.items():
                 setattr(db_complaint, key, value)
+            # Labels set by staff take precedence over pending background classification
+            if "category" in update_data or "urgency" in update_data:
+                db_complaint.classification_pending = False
+                db_complaint.labels_edited = True
+            # The stored vector describes the old text; clustering re-embeds it when needed
+            if "complaint_text" in update_data:
+                db_complaint.embedding = None
+                db_complaint.embedding_version = None
             db.commit()
             db.refresh(db_complaint)
+            notify_complaint_changed(complaint_id)
         return db_complaint
     
     @staticmethod
@@ -106,5 +162,6 @@ class ComplaintService:
         if db_complaint:
             db.delete(db_complaint)
             db.commit()
+            notify_complaint_deleted(complaint_id)
             return True
         return False
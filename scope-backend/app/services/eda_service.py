@@ -8,10 +8,13 @@ from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
 from sklearn.cluster import KMeans
 from sklearn.decomposition import PCA, LatentDirichletAllocation
 from sklearn.preprocessing import StandardScaler
-from sentence_transformers import SentenceTransformer
 from fastapi import HTTPException
 
 from app.models.domain.complaint import Complaint, Category, Urgency
+from app.core.config import settings
+from app.ml.model import get_model_predictor
+from app.ml.vectors import vector_from_bytes, vector_to_bytes
+from app.chatbot.embeddings import get_local_embeddings, get_local_embedding_model_name, with_embedding_cache
 
 
 class EdaService:
@@ -189,6 +192,41 @@ class EdaService:
         
         return [{"word": word, "count": count} for word, count in common_words]
     
+    @staticmethod
+    def get_stored_embeddings(db: Session, complaints: List[Complaint]) -> Optional[np.ndarray]:
+        """Classifier vectors for every complaint, or None if the classifier keeps none.
+
+        Stored vectors from the current model are used as they are; complaints without one
+        (or with one from an older model) are embedded now and the new vectors stored.
+        """
+        if not settings.STORE_COMPLAINT_EMBEDDINGS:
+            return None
+        predictor = get_model_predictor()
+        version = getattr(predictor, "fingerprint", None)
+        if version is None:
+            return None
+        
+        missing = [c for c in complaints if c.embedding is None or c.embedding_version != version]
+        missing_ids = {c.id for c in missing}
+        vectors = {c.id: vector_from_bytes(c.embedding) for c in complaints if c.id not in missing_ids}
+        if missing:
+            try:
+                embedded = predictor.embed_batch([str(c.complaint_text) for c in missing])
+            except Exception as e:
+                print(f"Error embedding complaints for clustering: {e}")
+                return None
+            if any(vector is None for vector in embedded):
+                return None
+            for c, vector in zip(missing, embedded):
+                vectors[c.id] = np.asarray(vector, dtype=np.float32)
+                c.embedding = vector_to_bytes(vector)
+                c.embedding_version = version
+        
+        result = np.vstack([vectors[c.id] for c in complaints])
+        if missing:
+            db.commit()
+        return result
+    
     @staticmethod
     def cluster_complaints(db: Session, n_clusters: int = 5) -> Dict[str, Any]:
         """Cluster complaints based on their content using NLP techniques."""
@@ -207,14 +245,18 @@ class EdaService:
         categories = [str(c.category) for c in complaints]
         urgencies = [str(c.urgency) for c in complaints]
         
-        try:
-            # Use sentence transformers for better embeddings
-            model = SentenceTransformer('all-MiniLM-L6-v2')
-            embeddings = model.encode(texts)
-        except Exception:
-            # Fall back to TF-IDF if sentence transformers fails
-            vectorizer = TfidfVectorizer(max_features=100)
-            embeddings = vectorizer.fit_transform(texts).toarray()
+        # Reuse the classifier vectors stored at intake, embedding only the complaints without a current one
+        embeddings = EdaService.get_stored_embeddings(db, complaints)
+        if embeddings is None:
+            try:
+                # Use sentence transformers for better embeddings, loaded once per process;
+                # texts embedded before come from the embeddings table
+                encoder = with_embedding_cache(get_local_embeddings(), get_local_embedding_model_name())
+                embeddings = encoder.encode(texts)
+            except Exception:
+                # Fall back to TF-IDF if sentence transformers fails
+                vectorizer = TfidfVectorizer(max_features=100)
+                embeddings = vectorizer.fit_transform(texts).toarray()
         
         # Scale embeddings
         scaler = StandardScaler()
@@ -2,15 +2,28 @@ from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 import os
+import threading
 
 from app.api.routes import api_router
 from app.core.config import settings
 from app.db.database import Base, engine, get_db
+from app.db.upgrade import upgrade_schema
 from app.models.domain.user import User, UserRole
 from app.core.security import get_password_hash
+from app.ml.inference_pool import get_pool_authkey
+from app.ml.model import warmup_model_predictor
+from app.ml.reload import get_model_reloader
+from app.ml.shadow import start_shadow_evaluator, stop_shadow_evaluator
+from app.chatbot.vector_index import save_complaint_index
+from app.services.classification_worker import start_classification_worker, stop_classification_worker
 
-# Create database tables
+# Create database tables, then add columns introduced since an existing database was created
 Base.metadata.create_all(bind=engine)
+upgrade_schema(engine)
+
+# The pool unpickles what it is sent, so never talk to it with a missing or placeholder key
+if settings.INFERENCE_BACKEND == "pool":
+    get_pool_authkey()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -72,6 +85,54 @@ async def create_initial_users():
         db.commit()
 
 
+# Load and warm up the classifier in the background so /ml/ready reports when it is usable
+@app.on_event("startup")
+async def warmup_model():
+    if settings.MODEL_WARMUP_ON_STARTUP:
+        threading.Thread(target=warmup_model_predictor, name="model-warmup", daemon=True).start()
+
+
+# Classify complaints stored as pending, including any left over from before a restart
+@app.on_event("startup")
+async def start_background_classification():
+    if settings.CLASSIFICATION_MODE == "async":
+        start_classification_worker()
+
+
+@app.on_event("shutdown")
+async def stop_background_classification():
+    stop_classification_worker()
+
+
+# Reload the classifier whenever its checkpoint file is replaced
+@app.on_event("startup")
+async def start_model_watcher():
+    if settings.MODEL_RELOAD_WATCH:
+        get_model_reloader().start_watching()
+
+
+@app.on_event("shutdown")
+async def stop_model_watcher():
+    get_model_reloader().stop_watching()
+
+
+# Compare a candidate model against the live one on sampled traffic
+@app.on_event("startup")
+async def start_shadow_evaluation():
+    start_shadow_evaluator()
+
+
+@app.on_event("shutdown")
+async def stop_shadow_evaluation():
+    stop_shadow_evaluator()
+
+
+# Write back vector index changes made since the last periodic save
+@app.on_event("shutdown")
+async def save_vector_index():
+    save_complaint_index()
+
+
 @app.get("/")
 def read_root():
     return {
@@ -0,0 +1,173 @@
+import argparse
+import json
+import multiprocessing as mp
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_list(value: str, cast=int) -> List:
+    return [cast(item) for item in value.split(",") if item.strip()]
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def run_backend(backend: str, threads: int, texts, categories, urgencies, batch_sizes, max_lengths, repeats) -> Dict[str, Any]:
+    """Benchmark one backend at one thread count; runs in its own process so RSS is isolated"""
+    import torch
+    from app.core.config import settings
+    from app.ml.evaluation import peak_rss_mb, score_predictions
+    from app.ml.model import ModelPredictor
+
+    # Measure the model itself, not the cache or the batching scheduler
+    settings.PREDICTION_CACHE_ENABLED = False
+    settings.INFERENCE_BATCHING = False
+    settings.ONNX_INTRA_OP_THREADS = threads
+    torch.set_num_threads(threads)
+
+    load_started = time.perf_counter()
+    predictor = ModelPredictor(backend=backend)
+    load_seconds = time.perf_counter() - load_started
+    rss_after_load = peak_rss_mb()
+    
+    # For the compiled backend this is where every length bucket gets compiled
+    warmup_started = time.perf_counter()
+    predictor.warmup()
+    warmup_seconds = time.perf_counter() - warmup_started
+
+    runs = []
+    for max_length in max_lengths:
+        predictor.max_length = max_length
+        for batch_size in batch_sizes:
+            # One untimed batch so lazy initialisation doesn't skew the first measurement
+            predictor._forward(texts[:batch_size])
+
+            latencies_ms = []
+            predictions = []
+            started = time.perf_counter()
+            for repeat in range(repeats):
+                for start in range(0, len(texts), batch_size):
+                    batch_started = time.perf_counter()
+                    results = predictor._forward(texts[start:start + batch_size])
+                    latencies_ms.append((time.perf_counter() - batch_started) * 1000)
+                    if repeat == 0:
+                        predictions.extend(results)
+            elapsed = time.perf_counter() - started
+
+            runs.append({
+                "backend": backend,
+                "threads": threads,
+                "max_length": max_length,
+                "batch_size": batch_size,
+                "batch_latency_ms": {
+                    "p50": percentile(latencies_ms, 0.50),
+                    "p95": percentile(latencies_ms, 0.95),
+                    "p99": percentile(latencies_ms, 0.99),
+                    "mean": sum(latencies_ms) / len(latencies_ms),
+                },
+                "per_text_latency_ms": sum(latencies_ms) / (len(texts) * repeats),
+                "throughput_texts_per_second": len(texts) * repeats / elapsed if elapsed > 0 else 0.0,
+                **score_predictions(predictions, categories, urgencies),
+            })
+            print(f"{backend:>10} threads={threads:<2} max_length={max_length:<4} batch={batch_size:<3} "
+                  f"p50={runs[-1]['batch_latency_ms']['p50']:.1f}ms "
+                  f"throughput={runs[-1]['throughput_texts_per_second']:.1f}/s "
+                  f"category_acc={runs[-1]['category_accuracy']:.3f}", flush=True)
+
+    return {
+        "backend": backend,
+        "threads": threads,
+        "load_seconds": load_seconds,
+        "warmup_seconds": warmup_seconds,
+        "compiled": predictor.get_stats()["compiled"],
+        "rss_after_load_mb": rss_after_load,
+        "peak_rss_mb": peak_rss_mb(),
+        "runs": runs,
+    }
+
+
+def _child(queue, *args):
+    try:
+        queue.put(run_backend(*args))
+    except Exception as e:
+        queue.put({"backend": args[0], "threads": args[1], "error": str(e)})
+
+
+def environment() -> Dict[str, Any]:
+    import torch
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "torch": torch.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the complaint classifier across backends and settings")
+    parser.add_argument("--csv", default="data/complaints.csv", help="Labelled complaints to sample from")
+    parser.add_argument("--samples", type=int, default=256, help="Number of complaints to run per configuration")
+    parser.add_argument("--backends", default="torch,compiled,quantized,onnx", help="Comma-separated backends to compare")
+    parser.add_argument("--batch-sizes", default="1,8,32", help="Comma-separated batch sizes")
+    parser.add_argument("--max-lengths", default="128,512", help="Comma-separated tokenizer max lengths")
+    parser.add_argument("--threads", default=str(min(4, os.cpu_count() or 1)), help="Comma-separated torch intra-op thread counts")
+    parser.add_argument("--repeats", type=int, default=1, help="Passes over the sample per configuration")
+    parser.add_argument("--output", default="benchmark-results.json", help="Where to write the JSON results")
+    args = parser.parse_args()
+
+    from app.ml.evaluation import load_labelled_complaints
+
+    texts, categories, urgencies = load_labelled_complaints(args.csv, args.samples)
+    batch_sizes = parse_list(args.batch_sizes)
+    max_lengths = parse_list(args.max_lengths)
+
+    # A fresh process per backend and thread count keeps peak RSS and thread pools independent
+    context = mp.get_context("spawn")
+    results = []
+    for backend in parse_list(args.backends, str):
+        for threads in parse_list(args.threads):
+            queue = context.Queue()
+            process = context.Process(
+                target=_child,
+                args=(queue, backend, threads, texts, categories, urgencies, batch_sizes, max_lengths, args.repeats)
+            )
+            process.start()
+            result = queue.get()
+            process.join()
+            if "error" in result:
+                print(f"{backend} with {threads} threads failed: {result['error']}")
+            results.append(result)
+
+    report = {
+        "environment": environment(),
+        "config": {
+            "csv": args.csv,
+            "samples": len(texts),
+            "batch_sizes": batch_sizes,
+            "max_lengths": max_lengths,
+            "repeats": args.repeats,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote benchmark results to {args.output}")
@@ -0,0 +1,211 @@
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Set, Tuple
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Course codes ("CHEM 102") and room numbers ("Room 204"), the identifiers embeddings tend to blur
+IDENTIFIER_PATTERN = re.compile(r"\b[A-Z]{2,5} ?\d{3,4}\b|\b[Rr]oom [A-Z]?-?\d{2,4}\b")
+# Letter and digit parts of an identifier, so its spelling variants can be matched
+IDENTIFIER_PARTS = re.compile(r"[A-Za-z]+|\d+")
+
+# Natural questions with no identifier in them, scored by how many hits share the expected category
+TOPICAL_QUERIES = [
+    ("can't get into my course because it's full", "Academic"),
+    ("professor never posts grades on time", "Academic"),
+    ("broken light in the library study area", "Facilities"),
+    ("elevator out of order in the science building", "Facilities"),
+    ("my roommate is noisy every night", "Housing"),
+    ("heating in the dorm room doesn't work", "Housing"),
+    ("wifi keeps disconnecting in my room", "IT Support"),
+    ("can't log in to the student portal", "IT Support"),
+    ("my scholarship payment hasn't arrived", "Financial Aid"),
+    ("questions about the tuition bill and loans", "Financial Aid"),
+    ("club event was cancelled without notice", "Campus Life"),
+    ("not enough activities on campus on weekends", "Campus Life"),
+    ("food in the cafeteria made me sick", "Dining Services"),
+    ("dining hall closes too early", "Dining Services"),
+]
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def identifier_queries(texts: List[str]) -> List[Tuple[str, Set[int]]]:
+    """One query per distinct identifier; relevant complaints are the ones that mention it.
+
+    Relevance is a case-insensitive regex over the raw text that allows a space, hyphen or
+    nothing between the identifier's parts ("CHEM 102", "chem-102", "Chem102"). It is kept
+    independent of the BM25 tokenizer so the benchmark does not grade BM25 by its own rules.
+    """
+    queries = {}
+    for text in texts:
+        for match in IDENTIFIER_PATTERN.findall(text):
+            parts = tuple(part.lower() for part in IDENTIFIER_PARTS.findall(match))
+            queries.setdefault(parts, match)
+    results = []
+    for parts, query in sorted(queries.items()):
+        pattern = re.compile(r"(?<![A-Za-z0-9])" + r"[ -]?".join(map(re.escape, parts)) + r"(?![A-Za-z0-9])", re.IGNORECASE)
+        results.append((query, {doc for doc, text in enumerate(texts) if pattern.search(text)}))
+    return results
+
+
+def known_item_queries(texts: List[str], count: int, words: int, rng) -> List[Tuple[str, Set[int]]]:
+    """A few shuffled content words from one complaint, which is the only relevant result.
+
+    Words are plain alphabetic runs longer than three letters, not BM25 terms, so the queries
+    don't favour the keyword retriever's stopword list.
+    """
+    queries = []
+    for doc in rng.sample(range(len(texts)), min(count, len(texts))):
+        terms = list(dict.fromkeys(word.lower() for word in re.findall(r"[A-Za-z]{4,}", texts[doc])))
+        if len(terms) < words:
+            continue
+        queries.append((" ".join(rng.sample(terms, words)), {doc}))
+    return queries
+
+
+def score(ranked: List[int], relevant: Set[int], k: int) -> Tuple[float, float]:
+    """Recall@k (against min(k, |relevant|)) and reciprocal rank of the first relevant hit"""
+    top = ranked[:k]
+    found = len(set(top) & relevant)
+    reciprocal = next((1.0 / rank for rank, doc in enumerate(top, start=1) if doc in relevant), 0.0)
+    return found / min(k, len(relevant)), reciprocal
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare BM25, vector and hybrid complaint search on latency and relevance")
+    parser.add_argument("--csv", default="data/complaints.csv", help="Complaints to index and draw queries from")
+    parser.add_argument("-k", type=int, default=10, help="Results per query; metrics are measured at this k")
+    parser.add_argument("--known-item-queries", type=int, default=300, help="Known-item queries to generate")
+    parser.add_argument("--known-item-words", type=int, default=4, help="Content words per known-item query")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the generated queries")
+    parser.add_argument("--output", default="search-benchmark.json", help="Where to write the JSON report")
+    args = parser.parse_args()
+
+    import numpy as np
+    import pandas as pd
+
+    from app.chatbot.embeddings import get_local_embedding_model_name, get_local_embeddings
+    from app.chatbot.keyword_index import BM25Index, reciprocal_rank_fusion
+    from app.chatbot.vector_index import create_faiss_index, normalize_rows
+    from app.core.config import settings
+
+    df = pd.read_csv(args.csv).dropna(subset=["complaint_text", "category"])
+    texts = df["complaint_text"].astype(str).tolist()
+    categories = df["category"].astype(str).tolist()
+    candidates = max(args.k, settings.HYBRID_SEARCH_CANDIDATES)
+
+    # Both retrievers index the CSV directly, the same way ComplaintVectorIndex keeps them
+    started = time.perf_counter()
+    keywords = BM25Index()
+    keywords.add_many(enumerate(texts))
+    bm25_build_seconds = time.perf_counter() - started
+
+    embeddings = get_local_embeddings()
+    started = time.perf_counter()
+    vectors = normalize_rows(np.asarray(embeddings.encode(texts), dtype=np.float32))
+    index = create_faiss_index("flat", vectors.shape[1])
+    index.add_with_ids(vectors, np.arange(len(texts), dtype=np.int64))
+    vector_build_seconds = time.perf_counter() - started
+    print(f"Indexed {len(texts)} complaints: BM25 in {bm25_build_seconds:.2f}s, vectors in {vector_build_seconds:.1f}s")
+
+    def vector_search(query: str, n: int) -> List[int]:
+        query_vector = normalize_rows(np.asarray([embeddings.embed_query(query)], dtype=np.float32))
+        _, labels = index.search(query_vector, n)
+        return [int(label) for label in labels[0] if label != -1]
+
+    def keyword_search(query: str, n: int) -> List[int]:
+        return [doc for doc, _ in keywords.search(query, n)]
+
+    def hybrid_search(query: str, n: int) -> List[int]:
+        fused = reciprocal_rank_fusion([vector_search(query, candidates), keyword_search(query, candidates)], n, settings.HYBRID_RRF_K)
+        return [doc for doc, _ in fused]
+
+    methods = {"bm25": keyword_search, "vector": vector_search, "hybrid": hybrid_search}
+    rng = random.Random(args.seed)
+    query_sets = {
+        "identifier": identifier_queries(texts),
+        "known_item": known_item_queries(texts, args.known_item_queries, args.known_item_words, rng),
+    }
+
+    results: Dict[str, Any] = {}
+    for method, search in methods.items():
+        search("warm up", args.k)
+        latencies = []
+        method_results = {}
+        for name, queries in query_sets.items():
+            recalls, reciprocals = [], []
+            for query, relevant in queries:
+                started = time.perf_counter()
+                ranked = search(query, args.k)
+                latencies.append((time.perf_counter() - started) * 1000)
+                recall, reciprocal = score(ranked, relevant, args.k)
+                recalls.append(recall)
+                reciprocals.append(reciprocal)
+            method_results[name] = {
+                "queries": len(queries),
+                f"recall_at_{args.k}": sum(recalls) / len(recalls) if recalls else 0.0,
+                "mrr": sum(reciprocals) / len(reciprocals) if reciprocals else 0.0,
+            }
+
+        precisions = []
+        for query, category in TOPICAL_QUERIES:
+            started = time.perf_counter()
+            ranked = search(query, args.k)
+            latencies.append((time.perf_counter() - started) * 1000)
+            precisions.append(sum(categories[doc] == category for doc in ranked) / args.k)
+        method_results["topical"] = {
+            "queries": len(TOPICAL_QUERIES),
+            f"category_precision_at_{args.k}": sum(precisions) / len(precisions),
+        }
+        method_results["latency_ms"] = {
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "mean": sum(latencies) / len(latencies),
+        }
+        results[method] = method_results
+
+    print(f"{'':>8}{'ident R@k':>11}{'ident MRR':>11}{'known R@k':>11}{'known MRR':>11}{'topic P@k':>11}{'p50 ms':>9}{'p95 ms':>9}")
+    for method, r in results.items():
+        print(f"{method:>8}"
+              f"{r['identifier'][f'recall_at_{args.k}']:>11.3f}{r['identifier']['mrr']:>11.3f}"
+              f"{r['known_item'][f'recall_at_{args.k}']:>11.3f}{r['known_item']['mrr']:>11.3f}"
+              f"{r['topical'][f'category_precision_at_{args.k}']:>11.3f}"
+              f"{r['latency_ms']['p50']:>9.2f}{r['latency_ms']['p95']:>9.2f}")
+
+    report = {
+        "environment": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            "csv": args.csv,
+            "complaints": len(texts),
+            "k": args.k,
+            "embedding_model": get_local_embedding_model_name(),
+            "hybrid_candidates": candidates,
+            "rrf_k": settings.HYBRID_RRF_K,
+            "seed": args.seed,
+        },
+        "bm25": {**keywords.stats(), "build_seconds": bm25_build_seconds},
+        "vector_build_seconds": vector_build_seconds,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
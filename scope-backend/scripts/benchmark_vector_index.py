@@ -0,0 +1,194 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def parse_list(value: str, cast=int) -> List:
+    return [cast(item) for item in value.split(",") if item.strip()]
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def base_vectors(args) -> "np.ndarray":
+    """Vectors the corpus is drawn around: real complaint embeddings, or synthetic cluster centres"""
+    import numpy as np
+
+    if args.source == "csv":
+        from app.chatbot.embeddings import get_local_embedding_model_name, get_local_embeddings, with_embedding_cache
+        from app.ml.evaluation import load_labelled_complaints
+
+        texts, _, _ = load_labelled_complaints(args.csv)
+        encoder = with_embedding_cache(get_local_embeddings(), get_local_embedding_model_name())
+        return np.asarray(encoder.encode(texts), dtype=np.float32)
+
+    rng = np.random.default_rng(args.seed)
+    return rng.standard_normal((args.clusters, args.dimension)).astype(np.float32)
+
+
+def sample_vectors(base: "np.ndarray", count: int, noise: float, rng) -> "np.ndarray":
+    """Unit vectors scattered around randomly chosen base vectors, generated in chunks"""
+    import numpy as np
+    from app.chatbot.vector_index import normalize_rows
+
+    out = np.empty((count, base.shape[1]), dtype=np.float32)
+    scale = noise * float(np.linalg.norm(base, axis=1).mean()) / np.sqrt(base.shape[1])
+    for start in range(0, count, 100000):
+        size = min(100000, count - start)
+        chosen = base[rng.integers(0, len(base), size)]
+        out[start:start + size] = chosen + rng.standard_normal(chosen.shape).astype(np.float32) * scale
+    return normalize_rows(out)
+
+
+def index_size_mb(index) -> float:
+    import faiss
+    return faiss.serialize_index(index).nbytes / (1024 * 1024)
+
+
+def measure(index, index_type: str, queries, truth, k: int, **knobs) -> Dict[str, Any]:
+    """Recall@k against exact search and single-query latency, one query at a time as the chatbot sends them"""
+    from app.chatbot.vector_index import search_parameters
+
+    params = search_parameters(index_type, **knobs)
+    latencies = []
+    found = 0
+    for query, expected in zip(queries, truth):
+        started = time.perf_counter()
+        _, labels = index.search(query[None, :], k, params=params)
+        latencies.append((time.perf_counter() - started) * 1000)
+        found += len(set(labels[0].tolist()) & set(expected.tolist()))
+    return {
+        **{name: value for name, value in knobs.items() if value is not None},
+        f"recall_at_{k}": found / (len(queries) * k),
+        "latency_ms": {
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "mean": sum(latencies) / len(latencies),
+        },
+    }
+
+
+def benchmark_size(size: int, base, args) -> Dict[str, Any]:
+    import faiss
+    import numpy as np
+    from app.chatbot.vector_index import create_faiss_index, ivf_nlist
+    from app.core.config import settings
+
+    rng = np.random.default_rng(args.seed + size)
+    corpus = sample_vectors(base, size, args.noise, rng)
+    queries = sample_vectors(base, args.queries, args.noise, rng)
+    ids = np.arange(size, dtype=np.int64)
+    dimension = corpus.shape[1]
+
+    results = []
+    truth = None
+    for index_type in parse_list(args.types, str):
+        started = time.perf_counter()
+        training_size = 0
+        if index_type == "ivf":
+            # Same training recipe as the service: a random sample of at most VECTOR_INDEX_TRAIN_SAMPLE
+            training = corpus[rng.choice(size, min(size, settings.VECTOR_INDEX_TRAIN_SAMPLE), replace=False)]
+            training_size = len(training)
+            index = create_faiss_index("ivf", dimension, training, size)
+        else:
+            index = create_faiss_index(index_type, dimension)
+        train_seconds = time.perf_counter() - started
+        if index_type == "hnsw":
+            index.add(corpus)
+        else:
+            index.add_with_ids(corpus, ids)
+        build_seconds = time.perf_counter() - started
+
+        if truth is None:
+            # Exact top-k from the flat index is the reference every approximate index is scored against
+            exact = create_faiss_index("flat", dimension)
+            exact.add_with_ids(corpus, ids)
+            _, truth = exact.search(queries, args.k)
+            del exact
+
+        if index_type == "ivf":
+            runs = [measure(index, "ivf", queries, truth, args.k, nprobe=n) for n in parse_list(args.nprobe) if n <= index.nlist]
+        elif index_type == "hnsw":
+            runs = [measure(index, "hnsw", queries, truth, args.k, ef_search=ef) for ef in parse_list(args.ef_search)]
+        else:
+            runs = [measure(index, "flat", queries, truth, args.k)]
+
+        result = {
+            "index_type": index_type,
+            "corpus_size": size,
+            "train_seconds": train_seconds if index_type == "ivf" else None,
+            "trained_on": training_size or None,
+            "nlist": index.nlist if index_type == "ivf" else None,
+            "nlist_default": ivf_nlist(size, training_size) if index_type == "ivf" else None,
+            "hnsw_m": settings.VECTOR_INDEX_HNSW_M if index_type == "hnsw" else None,
+            "build_seconds": build_seconds,
+            "index_mb": index_size_mb(index),
+            "runs": runs,
+        }
+        for run in runs:
+            knob = f"nprobe={run['nprobe']}" if "nprobe" in run else f"efSearch={run['ef_search']}" if "ef_search" in run else "exact"
+            print(f"{size:>9} {index_type:>5} {knob:<13} recall@{args.k}={run[f'recall_at_{args.k}']:.3f} "
+                  f"p50={run['latency_ms']['p50']:.2f}ms p95={run['latency_ms']['p95']:.2f}ms "
+                  f"build={build_seconds:.1f}s size={result['index_mb']:.0f}MB", flush=True)
+        results.append(result)
+        del index
+
+    return {"corpus_size": size, "corpus_mb": corpus.nbytes / (1024 * 1024), "results": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare flat, IVF and HNSW complaint indexes on recall, latency and memory")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated corpus sizes")
+    parser.add_argument("--types", default="flat,ivf,hnsw", help="Comma-separated index types to compare")
+    parser.add_argument("--source", choices=("synthetic", "csv"), default="synthetic",
+                        help="Draw the corpus around synthetic cluster centres, or around embedded complaints from --csv")
+    parser.add_argument("--csv", default="data/complaints.csv", help="Complaints embedded with the local model for --source csv")
+    parser.add_argument("--dimension", type=int, default=384, help="Vector dimension for synthetic data (all-MiniLM-L6-v2 is 384)")
+    parser.add_argument("--clusters", type=int, default=2000, help="Synthetic cluster centres")
+    parser.add_argument("--noise", type=float, default=0.5, help="Spread of each vector around its base vector, relative to the base norm")
+    parser.add_argument("--queries", type=int, default=500, help="Held-out query vectors per corpus size")
+    parser.add_argument("-k", type=int, default=10, help="Neighbours per query; recall@k is measured at this k")
+    parser.add_argument("--nprobe", default="1,4,16,64,256", help="Comma-separated IVF nprobe values to sweep")
+    parser.add_argument("--ef-search", default="16,32,64,128,256", help="Comma-separated HNSW efSearch values to sweep")
+    parser.add_argument("--threads", type=int, default=min(4, os.cpu_count() or 1), help="FAISS OpenMP threads")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the corpus, queries and training sample")
+    parser.add_argument("--output", default="vector-index-report.json", help="Where to write the JSON report")
+    args = parser.parse_args()
+
+    import faiss
+
+    faiss.omp_set_num_threads(args.threads)
+    base = base_vectors(args)
+    print(f"Drawing corpora around {len(base)} {args.source} base vectors of dimension {base.shape[1]}")
+
+    sizes = []
+    for size in parse_list(args.sizes):
+        sizes.append(benchmark_size(size, base, args))
+
+    report = {
+        "environment": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "faiss": faiss.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "threads": args.threads,
+        },
+        "config": {key: value for key, value in vars(args).items() if key != "output"},
+        "sizes": sizes,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
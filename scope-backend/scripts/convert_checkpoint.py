@@ -0,0 +1,44 @@
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from safetensors.torch import save_file
+from transformers import AutoConfig, AutoTokenizer
+
+from app.core.config import settings
+from app.ml.labels import LABELS_FILENAME, save_label_encoders
+from app.ml.model import load_checkpoint
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert model.pt to memory-mappable safetensors with sidecar files")
+    parser.add_argument("--model-path", default="model/model.pt", help="Pickled torch checkpoint to convert")
+    parser.add_argument("--output", default="model/model.safetensors", help="Where to write the safetensors weights")
+    parser.add_argument("--labels-path", default=None, help="Where to write the label encoders (default: labels.json beside --output)")
+    args = parser.parse_args()
+    
+    model, le_cat, le_urg = load_checkpoint(args.model_path)
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    labels_path = args.labels_path or output.parent / LABELS_FILENAME
+    
+    # Plain contiguous tensors only, so the file can be memory-mapped as-is
+    state = {name: tensor.contiguous() for name, tensor in model.state_dict().items()}
+    save_file(state, str(output))
+    save_label_encoders(labels_path, le_cat, le_urg)
+    
+    # Keep the encoder config and tokenizer next to the weights so loading needs no download
+    AutoConfig.from_pretrained(settings.MODEL).save_pretrained(output.parent)
+    AutoTokenizer.from_pretrained(settings.MODEL).save_pretrained(output.parent)
+    print(f"Wrote {output}, {labels_path} and the encoder config/tokenizer to {output.parent}")
+    
+    # Quick check that the converted checkpoint loads
+    started = time.perf_counter()
+    load_checkpoint(output)
+    print(f"Loaded converted checkpoint in {time.perf_counter() - started:.2f}s")
+    print(f"Set MODEL_PATH={output} to use it")
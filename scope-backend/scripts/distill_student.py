@@ -0,0 +1,176 @@
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def profile_model(name: str, model_path: str, texts: List[str], categories, urgencies, latency_samples: int, threads: int) -> Dict[str, Any]:
+    """Load one checkpoint and measure it; runs in its own process so peak RSS is its own"""
+    import torch
+    from app.core.config import settings
+    from app.ml.distillation import parameter_count
+    from app.ml.evaluation import peak_rss_mb, score_predictions, state_dict_size_mb
+    from app.ml.model import ModelPredictor
+
+    # Measure the encoder itself, not the cache, the cascade or the batching scheduler
+    settings.PREDICTION_CACHE_ENABLED = False
+    settings.CASCADE_ENABLED = False
+    settings.INFERENCE_BATCHING = False
+    torch.set_num_threads(threads)
+
+    load_started = time.perf_counter()
+    predictor = ModelPredictor(backend="torch", model_path=model_path)
+    load_seconds = time.perf_counter() - load_started
+    predictor.warmup()
+
+    # Per-complaint latency, one text at a time as the API sees it
+    latencies = []
+    for text in texts[:latency_samples]:
+        started = time.perf_counter()
+        predictor._forward([text])
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+
+    started = time.perf_counter()
+    predictions = []
+    for start in range(0, len(texts), settings.INFERENCE_BATCH_CHUNK_SIZE):
+        predictions.extend(predictor._forward(texts[start:start + settings.INFERENCE_BATCH_CHUNK_SIZE]))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "name": name,
+        "model_path": model_path,
+        "encoder": predictor.model.enc.config.name_or_path,
+        "parameters": parameter_count(predictor.model),
+        "size_mb": state_dict_size_mb(predictor.model),
+        "load_seconds": load_seconds,
+        "peak_rss_mb": peak_rss_mb(),
+        "p50_latency_ms": latencies[len(latencies) // 2] if latencies else 0.0,
+        "p95_latency_ms": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] if latencies else 0.0,
+        "throughput_texts_per_second": len(texts) / elapsed if elapsed > 0 else 0.0,
+        **score_predictions(predictions, categories, urgencies),
+        "predictions": [{"category": p["category"], "urgency": p["urgency"]} for p in predictions],
+    }
+
+
+def _child(queue, *args):
+    try:
+        queue.put(profile_model(*args))
+    except Exception as e:
+        queue.put({"name": args[0], "error": str(e)})
+
+
+def profile_in_subprocess(*args) -> Dict[str, Any]:
+    context = mp.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_child, args=(queue, *args))
+    process.start()
+    result = queue.get()
+    process.join()
+    if "error" in result:
+        raise RuntimeError(f"Profiling {result['name']} failed: {result['error']}")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distill the RoBERTa classifier into a smaller student encoder")
+    parser.add_argument("--csv", default="data/complaints.csv", help="Labelled complaints to distill on")
+    parser.add_argument("--teacher-path", default=None, help="Teacher checkpoint (defaults to MODEL_PATH)")
+    parser.add_argument("--student", default="distilroberta-base", help="Pretrained encoder to use as the student")
+    parser.add_argument("--output-dir", default="model/student", help="Where to write the student checkpoint, config and tokenizer")
+    parser.add_argument("--epochs", type=int, default=3, help="Training epochs")
+    parser.add_argument("--batch-size", type=int, default=16, help="Training batch size")
+    parser.add_argument("--learning-rate", type=float, default=5e-5, help="Peak AdamW learning rate")
+    parser.add_argument("--temperature", type=float, default=2.0, help="Softmax temperature applied to teacher and student logits")
+    parser.add_argument("--alpha", type=float, default=0.7, help="Weight of the soft-label loss against the hard-label loss")
+    parser.add_argument("--max-length", type=int, default=128, help="Tokenizer max length during distillation")
+    parser.add_argument("--latency-samples", type=int, default=100, help="Complaints timed one at a time in the report")
+    parser.add_argument("--threads", type=int, default=min(4, os.cpu_count() or 1), help="Torch threads used for the report")
+    parser.add_argument("--report", default="distillation-report.json", help="Where to write the teacher/student report")
+    parser.add_argument("--skip-training", action="store_true", help="Only write the report for an existing student")
+    args = parser.parse_args()
+
+    import pandas as pd
+    import torch
+    from sklearn.model_selection import train_test_split
+    from transformers import AutoTokenizer
+
+    from app.core.config import settings
+    from app.ml.distillation import save_student, teacher_logits, train_student
+    from app.ml.evaluation import agreement
+    from app.ml.model import load_checkpoint, model_source
+
+    teacher_path = args.teacher_path or settings.MODEL_PATH
+    student_path = os.path.join(args.output_dir, "model.pt")
+
+    # Same split as the original training notebook, so the report scores both models on
+    # complaints the teacher never saw
+    df = pd.read_csv(args.csv).dropna(subset=["complaint_text", "category", "urgency"])
+    train_df, val_df = train_test_split(df, test_size=0.2, stratify=df["category"], random_state=42)
+    train_texts = train_df["complaint_text"].astype(str).tolist()
+    print(f"Distilling on {len(train_df)} complaints, reporting on {len(val_df)}")
+
+    if not args.skip_training:
+        device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+        teacher, le_cat, le_urg = load_checkpoint(teacher_path, device)
+        teacher_tokenizer = AutoTokenizer.from_pretrained(model_source(teacher_path))
+
+        started = time.perf_counter()
+        soft_labels = teacher_logits(teacher, teacher_tokenizer, train_texts, max_length=args.max_length, device=device)
+        print(f"Computed teacher soft labels in {time.perf_counter() - started:.1f}s")
+        del teacher
+
+        student = train_student(
+            args.student,
+            train_texts,
+            le_cat.transform(train_df["category"].astype(str)).tolist(),
+            le_urg.transform(train_df["urgency"].astype(str)).tolist(),
+            soft_labels,
+            num_genres=len(le_cat.classes_),
+            num_priority=len(le_urg.classes_),
+            epochs=args.epochs,
+            batch_size=args.batch_size,
+            learning_rate=args.learning_rate,
+            temperature=args.temperature,
+            alpha=args.alpha,
+            max_length=args.max_length,
+            device=device
+        )
+        student_path = str(save_student(student.cpu(), args.student, args.output_dir, le_cat, le_urg))
+        print(f"Wrote the student to {student_path}")
+        del student
+
+    # Each model is measured in a fresh process so memory numbers don't include the other
+    texts = val_df["complaint_text"].astype(str).tolist()
+    categories = val_df["category"].astype(str).tolist()
+    urgencies = val_df["urgency"].astype(str).tolist()
+    teacher_report = profile_in_subprocess("teacher", teacher_path, texts, categories, urgencies, args.latency_samples, args.threads)
+    student_report = profile_in_subprocess("student", student_path, texts, categories, urgencies, args.latency_samples, args.threads)
+
+    report = {
+        "samples": len(texts),
+        "threads": args.threads,
+        "teacher": {k: v for k, v in teacher_report.items() if k != "predictions"},
+        "student": {k: v for k, v in student_report.items() if k != "predictions"},
+        "speedup_p50": teacher_report["p50_latency_ms"] / student_report["p50_latency_ms"] if student_report["p50_latency_ms"] else 0.0,
+        "size_ratio": teacher_report["size_mb"] / student_report["size_mb"] if student_report["size_mb"] else 0.0,
+        "category_accuracy_delta": student_report["category_accuracy"] - teacher_report["category_accuracy"],
+        "urgency_accuracy_delta": student_report["urgency_accuracy"] - teacher_report["urgency_accuracy"],
+        **agreement(teacher_report["predictions"], student_report["predictions"]),
+    }
+
+    print(f"{'':>24}{'teacher':>14}{'student':>14}")
+    for key in ("parameters", "size_mb", "peak_rss_mb", "load_seconds", "p50_latency_ms", "p95_latency_ms",
+                "throughput_texts_per_second", "category_accuracy", "urgency_accuracy", "joint_accuracy"):
+        print(f"{key:>24}{report['teacher'][key]:>14.3f}{report['student'][key]:>14.3f}")
+    print(f"Agreement with the teacher: category {report['category_agreement']:.3f}, urgency {report['urgency_agreement']:.3f}")
+
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.report}. Set MODEL_PATH={student_path} (and MODEL={args.student}) to serve the student")
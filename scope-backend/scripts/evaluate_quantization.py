@@ -0,0 +1,64 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.ml.model import ModelPredictor
+from app.ml.evaluation import load_labelled_complaints, score_predictions, agreement, state_dict_size_mb
+
+
+def evaluate(predictor: ModelPredictor, texts, categories, urgencies, latency_samples: int):
+    predictions = predictor.predict_batch(texts)
+    
+    # Per-complaint latency, one text at a time as the API sees it
+    latencies = []
+    for text in texts[:latency_samples]:
+        started = time.perf_counter()
+        predictor.predict(text)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    
+    report = score_predictions(predictions, categories, urgencies)
+    report["size_mb"] = state_dict_size_mb(predictor.model)
+    report["mean_latency_ms"] = sum(latencies) / len(latencies) if latencies else 0.0
+    report["p50_latency_ms"] = latencies[len(latencies) // 2] if latencies else 0.0
+    return predictions, report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare the int8 quantized classifier against fp32")
+    parser.add_argument("--csv", default="data/complaints.csv", help="Labelled complaints to evaluate on")
+    parser.add_argument("--limit", type=int, default=None, help="Evaluate on a random sample of this size")
+    parser.add_argument("--latency-samples", type=int, default=100, help="Complaints timed one at a time")
+    parser.add_argument("--output", default=None, help="Optional path to write the JSON report")
+    args = parser.parse_args()
+    
+    # Time real forward passes rather than cache hits
+    settings.PREDICTION_CACHE_ENABLED = False
+    
+    texts, categories, urgencies = load_labelled_complaints(args.csv, args.limit)
+    print(f"Evaluating on {len(texts)} complaints from {args.csv}")
+    
+    fp32_predictions, fp32 = evaluate(ModelPredictor(backend="torch"), texts, categories, urgencies, args.latency_samples)
+    int8_predictions, int8 = evaluate(ModelPredictor(backend="quantized"), texts, categories, urgencies, args.latency_samples)
+    
+    report = {
+        "samples": len(texts),
+        "fp32": fp32,
+        "int8": int8,
+        "category_accuracy_delta": int8["category_accuracy"] - fp32["category_accuracy"],
+        "urgency_accuracy_delta": int8["urgency_accuracy"] - fp32["urgency_accuracy"],
+        "size_ratio": fp32["size_mb"] / int8["size_mb"] if int8["size_mb"] else 0.0,
+        "latency_speedup": fp32["mean_latency_ms"] / int8["mean_latency_ms"] if int8["mean_latency_ms"] else 0.0,
+        **agreement(fp32_predictions, int8_predictions),
+    }
+    
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
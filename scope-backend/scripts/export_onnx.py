@@ -0,0 +1,34 @@
+import argparse
+import json
+import os
+import sys
+
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.ml.onnx_backend import export_onnx, check_parity
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the complaint classifier to ONNX and check parity with torch")
+    parser.add_argument("--model-path", default=settings.MODEL_PATH, help="Torch checkpoint to export")
+    parser.add_argument("--onnx-path", default=settings.ONNX_MODEL_PATH, help="Where to write the ONNX graph")
+    parser.add_argument("--labels-path", default=None, help="Where to write the label encoders (default: labels.json beside the ONNX model)")
+    parser.add_argument("--csv", default="data/complaints.csv", help="Complaints used for the parity check")
+    parser.add_argument("--samples", type=int, default=200, help="Number of complaints to compare (0 skips the check)")
+    args = parser.parse_args()
+
+    paths = export_onnx(args.model_path, args.onnx_path, args.labels_path)
+    print(f"Exported ONNX model to {paths['onnx_path']} and label encoders to {paths['labels_path']}")
+
+    if args.samples > 0:
+        df = pd.read_csv(args.csv)
+        texts = df["complaint_text"].sample(n=min(args.samples, len(df)), random_state=42).tolist()
+        report = check_parity(texts, args.model_path, args.onnx_path)
+        print(json.dumps(report, indent=2))
+        if not report["passed"]:
+            print("Parity check failed: ONNX predictions differ from the torch model")
+            sys.exit(1)
@@ -0,0 +1,47 @@
+import argparse
+import os
+import sys
+
+import torch
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.ml.inference_pool import InferencePoolServer, get_pool_authkey
+from app.ml.model import ModelPredictor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the complaint classifier from a pool of forked workers")
+    parser.add_argument("--address", default=settings.INFERENCE_POOL_ADDRESS, help="host:port or unix socket path")
+    parser.add_argument("--backend", default=settings.INFERENCE_POOL_BACKEND, help="Backend the workers run (torch or quantized)")
+    parser.add_argument("--workers", type=int, default=settings.INFERENCE_POOL_WORKERS, help="Number of worker processes")
+    parser.add_argument("--threads-per-worker", type=int, default=settings.INFERENCE_POOL_THREADS_PER_WORKER or None,
+                        help="Torch intra-op threads per worker (default: cores / workers)")
+    args = parser.parse_args()
+    
+    if args.backend == "pool":
+        print("The inference pool cannot itself use the pool backend")
+        sys.exit(1)
+    try:
+        authkey = get_pool_authkey()
+    except RuntimeError as e:
+        print(e)
+        sys.exit(1)
+    
+    # Keep the parent single-threaded: an OpenMP pool started before fork can hang the workers
+    torch.set_num_threads(1)
+    
+    # Workers call the forward pass directly, so no batcher thread is needed in the parent
+    settings.INFERENCE_BATCHING = False
+    predictor = ModelPredictor(backend=args.backend)
+    
+    server = InferencePoolServer(predictor, num_workers=args.workers, threads_per_worker=args.threads_per_worker)
+    server.start_workers()
+    try:
+        server.serve_forever(args.address, authkey)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
@@ -0,0 +1,226 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from sqlalchemy import create_engine, update
+from sqlalchemy.orm import Session, sessionmaker
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.database import SessionLocal, engine as default_engine
+from app.db.upgrade import missing_columns, upgrade_schema
+from app.ml.model import get_model_predictor
+from app.ml.vectors import vector_to_bytes
+from app.models.domain.complaint import Complaint
+
+
+def label(value) -> str:
+    """Plain string for an enum column value, or 'None' when unset"""
+    if value is None:
+        return "None"
+    return getattr(value, "value", str(value))
+
+
+def load_checkpoint(path: Path, fingerprint: str) -> dict:
+    """Resume from a previous run of the same model, otherwise start from the first complaint"""
+    fresh = {
+        "model_fingerprint": fingerprint,
+        "last_id": 0,
+        "processed": 0,
+        "updated": 0,
+        "skipped_manual": 0,
+        "embeddings_refreshed": 0,
+        "category_changes": {},
+        "urgency_changes": {},
+    }
+    if not path.exists():
+        return fresh
+
+    with open(path) as f:
+        state = json.load(f)
+    if state.get("model_fingerprint") != fingerprint:
+        print(f"Checkpoint {path} was written for a different model, starting over")
+        return fresh
+    print(f"Resuming after complaint #{state['last_id']} ({state['processed']} already processed)")
+    return state
+
+
+def save_checkpoint(path: Path, state: dict):
+    # Write then rename so an interrupted run never leaves a half-written checkpoint
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def reclassify(
+    db: Session,
+    state: dict,
+    chunk_size: int,
+    dry_run: bool,
+    checkpoint_path: Path = None,
+    overwrite_manual: bool = False
+) -> dict:
+    """Re-score complaints in id order, writing only rows whose labels changed.
+
+    Labels staff set by hand are final and skipped unless overwrite_manual is set. Every row
+    written gets the new model's stored vector, or none, so no vector outlives its labels.
+    """
+    predictor = get_model_predictor()
+    # Checkpoints written before these counters existed
+    state.setdefault("skipped_manual", 0)
+    state.setdefault("embeddings_refreshed", 0)
+    category_changes = Counter(state["category_changes"])
+    urgency_changes = Counter(state["urgency_changes"])
+    started = time.perf_counter()
+    processed_this_run = 0
+
+    while True:
+        # Keyset pagination keeps every chunk query cheap however far in we are
+        rows = (
+            db.query(
+                Complaint.id,
+                Complaint.complaint_text,
+                Complaint.category,
+                Complaint.urgency,
+                Complaint.classification_pending,
+                Complaint.labels_edited,
+                Complaint.embedding_version
+            )
+            .filter(Complaint.id > state["last_id"])
+            .order_by(Complaint.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not rows:
+            break
+
+        skipped = [row for row in rows if row.labels_edited and not overwrite_manual]
+        rows_to_score = [row for row in rows if not (row.labels_edited and not overwrite_manual)]
+        predictions = predictor.predict_batch([str(row.complaint_text) for row in rows_to_score]) if rows_to_score else []
+
+        changes = []
+        labels_changed = 0
+        embeddings_refreshed = 0
+        for row, prediction in zip(rows_to_score, predictions):
+            old_category, old_urgency = label(row.category), label(row.urgency)
+            new_category, new_urgency = prediction["category"], prediction["urgency"]
+            category_changes[f"{old_category} -> {new_category}"] += 1
+            urgency_changes[f"{old_urgency} -> {new_urgency}"] += 1
+
+            relabel = old_category != new_category or old_urgency != new_urgency or row.classification_pending
+            # A vector from an older model is stale whether or not the labels moved
+            stale_vector = row.embedding_version is not None and row.embedding_version != prediction.get("model_version")
+            if not (relabel or stale_vector):
+                continue
+
+            change = {"id": row.id}
+            if relabel:
+                change.update(category=new_category, urgency=new_urgency, classification_pending=False, labels_edited=False)
+                labels_changed += 1
+            # Replace the vector with this model's, or drop it when the prediction has none
+            # (cascade answers, or STORE_COMPLAINT_EMBEDDINGS off)
+            if prediction.get("embedding") is not None:
+                change.update(embedding=vector_to_bytes(prediction["embedding"]), embedding_version=prediction.get("model_version"))
+            else:
+                change.update(embedding=None, embedding_version=None)
+            embeddings_refreshed += 1
+            changes.append(change)
+
+        # Bulk UPDATEs by primary key; rows are grouped by the columns they set
+        for columns in {tuple(sorted(change)) for change in changes}:
+            db.execute(update(Complaint), [change for change in changes if tuple(sorted(change)) == columns])
+        if dry_run:
+            db.rollback()
+        else:
+            db.commit()
+
+        state["last_id"] = rows[-1].id
+        state["processed"] += len(rows)
+        state["updated"] += labels_changed
+        state["skipped_manual"] += len(skipped)
+        state["embeddings_refreshed"] += embeddings_refreshed
+        state["category_changes"] = dict(category_changes)
+        state["urgency_changes"] = dict(urgency_changes)
+        processed_this_run += len(rows)
+
+        if checkpoint_path is not None and not dry_run:
+            save_checkpoint(checkpoint_path, state)
+
+        elapsed = time.perf_counter() - started
+        print(f"Processed up to complaint #{state['last_id']}: {state['processed']} rows, "
+              f"{state['updated']} changed, {state['skipped_manual']} staff-labelled skipped, "
+              f"{processed_this_run / elapsed:.1f} rows/s")
+
+    elapsed = time.perf_counter() - started
+    return {
+        **state,
+        "dry_run": dry_run,
+        "elapsed_seconds": elapsed,
+        "rows_per_second": processed_this_run / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def print_confusion(title: str, changes: dict):
+    print(f"\n{title} (old -> new):")
+    for transition, count in sorted(changes.items(), key=lambda item: -item[1]):
+        old, new = transition.split(" -> ")
+        marker = "" if old == new else "  *"
+        print(f"  {transition}: {count}{marker}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-score stored complaints with the current model")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Complaints read and updated per chunk")
+    parser.add_argument("--checkpoint", default="reclassify-checkpoint.json", help="Progress file used to resume")
+    parser.add_argument("--restart", action="store_true", help="Ignore any existing checkpoint")
+    parser.add_argument("--dry-run", action="store_true", help="Classify and report without writing anything")
+    parser.add_argument("--database-url", default=None, help="Run against another database, e.g. a copy of production")
+    parser.add_argument("--report", default=None, help="Optional path to write the final JSON report")
+    parser.add_argument("--overwrite-manual", action="store_true", help="Also re-label complaints whose labels staff set by hand")
+    args = parser.parse_args()
+
+    if args.database_url:
+        engine = create_engine(args.database_url, connect_args={"check_same_thread": False} if args.database_url.startswith("sqlite") else {})
+        db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    else:
+        engine = default_engine
+        db = SessionLocal()
+    # The script may run against a database the upgraded app has never started on. A dry run
+    # writes nothing, schema included, so it can only report what is missing
+    if not args.dry_run:
+        upgrade_schema(engine)
+    elif missing_columns(engine):
+        print(f"Database is missing {', '.join(missing_columns(engine))}. Start the app on it once, "
+              f"or run without --dry-run, to add them")
+        sys.exit(1)
+
+    checkpoint_path = Path(args.checkpoint)
+    fingerprint = get_model_predictor().get_stats()["fingerprint"]
+    if fingerprint is None:
+        print("Model failed to load, refusing to reclassify with the fallback predictor")
+        sys.exit(1)
+
+    if args.restart and checkpoint_path.exists():
+        checkpoint_path.unlink()
+    state = load_checkpoint(checkpoint_path, fingerprint)
+
+    try:
+        report = reclassify(db, state, args.chunk_size, args.dry_run, checkpoint_path, args.overwrite_manual)
+    finally:
+        db.close()
+
+    print_confusion("Category changes", report["category_changes"])
+    print_confusion("Urgency changes", report["urgency_changes"])
+    print(f"\n{report['processed']} complaints processed, {report['updated']} "
+          f"{'would change' if args.dry_run else 'updated'}, {report['skipped_manual']} staff-labelled skipped, "
+          f"{report['rows_per_second']:.1f} rows/s")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)